@@ -37,6 +37,27 @@ def main():
         action="store_true",
         default=False,
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        help="the number of modules, that are executed at the same time",
+        type=int,
+        default=1,
+    )
+    parser.add_argument(
+        "-a",
+        "--asynchronous",
+        help="executes the modules in an asyncio event loop",
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "-d",
+        "--deferred",
+        help="notifies the modules about the knowledge of a module only when it is finished",
+        action="store_true",
+        default=False,
+    )
     args = parser.parse_args()
 
     # verbosity
@@ -92,7 +113,15 @@ def main():
         ]
 
     flags = [CreateFlag]
-    App = Application(FastStrategy, start_knowledge, modules, flags)  # noqa F841
+    App = Application(  # noqa F841
+        FastStrategy,
+        start_knowledge,
+        modules,
+        flags,
+        workers=args.workers,
+        asynchronous=args.asynchronous,
+        deferred=args.deferred,
+    )
 
     App.start()
     logger.info("Exiting")
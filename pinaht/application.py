@@ -1,9 +1,15 @@
-from typing import List, Tuple
+from typing import List, Tuple, Dict, Set, Hashable, Union
+from concurrent.futures import ThreadPoolExecutor, Future
+import asyncio
+import queue
 from pinaht.knowledge import knowledge_graph as kg
 from pinaht.knowledge import execution_graph as eg
 from pinaht.file_manager import FileManager
 from pinaht.knowledge.manager import Manager, BufferedModuleManager
 from pinaht.knowledge.types.knowledge import Knowledge
+from pinaht.knowledge.precondition import precondition_cache
+from pinaht.knowledge.types.shell import Shell
+from pinaht.knowledge.types.ssh_pool import ssh_pool
 from pinaht.knowledge.duality_edge import DualityEdgeType
 from pinaht.modules.module import Module, ModuleError
 from pinaht.flags.flag import Flag
@@ -30,23 +36,40 @@ class Application:
         start_knowledge: List[Tuple[Knowledge, str, Knowledge]],
         modules: List[Module],
         flags: List[Flag],
+        workers: int = 1,
+        asynchronous: bool = False,
+        deferred: bool = False,
     ):
         """
         the entry point of the application.
 
         :param strategy: the Strategy, which the programme follows
         :param start_knowledge: a list of knowledge pairs (parent, knowledge), that is initially known
+        :param workers: the number of modules, that are executed at the same time
+        :param asynchronous: whether the modules are executed in an asyncio event loop, see Module.execute_async
+        :param deferred: whether the dependencies are notified about the flushed knowledge of a module only when it
+                         is finished, see BufferedModuleManager
         """
+        if workers < 1:
+            raise ValueError("workers must be at least 1")
+
         self._logger = logging.getLogger("Application")
         self._logger.info("init pinaht main...")
 
         self.execution_graph = eg.ExecutionGraph()
         self.knowledge_graph = kg.KnowledgeGraph()
         self.manager = Manager(self.knowledge_graph, self.execution_graph)
+        # the cache keeps the knowledge of previous applications alive
+        precondition_cache.clear()
         self.file_manager = FileManager(int(ipaddress.IPv4Address("255.255.255.0")))
         self.file_manager.start_server()
         self.start_time = None
         self.end_time = None
+        self.workers = workers
+        self.asynchronous = asynchronous
+        self.deferred = deferred
+        self.pending_execution = None
+        self.stopped = False
 
         # init all the modules
         kwargs = {"manager": self.manager, "file_manager": self.file_manager}
@@ -55,13 +78,15 @@ class Application:
 
         self.strategy = strategy_class(self.modules, self.flags, self.knowledge_graph, self.execution_graph)
 
-        for parent, key, knowledge in start_knowledge:
-            self.manager.add_knowledge(parent, key, knowledge)
-            self.manager.notify(knowledge)
+        # the dependencies are notified once about all start knowledge
+        with self.manager.deferred():
+            for parent, key, knowledge in start_knowledge:
+                self.manager.add_knowledge(parent, key, knowledge)
+                self.manager.notify(knowledge)
 
-            self.manager.draw_duality_edge(knowledge, self.execution_graph.root, 0.99, DualityEdgeType.ADD)
-            if parent is not None:
-                self.manager.draw_duality_edge(parent, self.execution_graph.root, 0.99, DualityEdgeType.ADD)
+                self.manager.draw_duality_edge(knowledge, self.execution_graph.root, 0.99, DualityEdgeType.ADD)
+                if parent is not None:
+                    self.manager.draw_duality_edge(parent, self.execution_graph.root, 0.99, DualityEdgeType.ADD)
 
                 if knowledge.type == "BRANCH":
                     self.execution_graph.root.module_doc.append(f"{parent!s} has a {knowledge!s}.")
@@ -88,6 +113,39 @@ class Application:
             + f"on {util.formated_date(self.start_time)} local time:"
         )
 
+        if self.asynchronous:
+            self.run_async()
+        elif self.workers == 1:
+            self.run_sequential()
+        else:
+            self.run_concurrent()
+
+        self.end_time = time.time()
+        self._logger.info(
+            f"ended with execution at {util.formated_time(self.end_time)} "
+            + f"on {util.formated_date(self.end_time)} local time:"
+        )
+
+        self.file_manager.shutdown_server()
+        ssh_pool.close()
+
+        # visualization
+        generate_execution_graph_visualization(self.execution_graph, self.strategy.flags)
+        visualization_str = self.manager.gen_visualization()
+        dot = Source(visualization_str)
+        cwd = os.getcwd()
+        dot.render(os.path.join(cwd, "reports", "knowledge_graph.gv"))
+
+        generate_report(self.knowledge_graph, self.execution_graph, self.strategy.flags, f"{os.getcwd()}/reports")
+
+        duration = self.end_time - self.start_time
+        self._logger.info(f"the execution took {util.formated_duration(duration)}")
+
+    def run_sequential(self):
+        """
+        executes one module after another, until the strategy is finished
+        """
+
         while not self.strategy.finished():
             try:
                 self._logger.info("strategy starts evaluating next module...")
@@ -95,10 +153,10 @@ class Application:
                 self._logger.debug(list(map(lambda e: (e.name, e.priority), self.strategy.strategy_elements)))
                 self._logger.info(f"next module is {module_name}, with priority {priority}")
 
-                buffered_module_manager = BufferedModuleManager(module_name, time.time())
+                buffered_module_manager = BufferedModuleManager(module_name, time.time(), self.deferred)
                 module.execute(buffered_module_manager, meta_key, keyed_knowledge)
                 buffered_module_manager.add_timestamp_end(time.time())
-                self.manager.add_module(buffered_module_manager, justification)
+                self.merge(buffered_module_manager, justification)
 
             except ModuleError:
                 self._logger.info("an error occurred in the module, ignoring")
@@ -110,22 +168,219 @@ class Application:
                 self._logger.debug(list(map(lambda e: (e.name, e.priority), self.strategy.strategy_elements)))
                 break
 
-        self.end_time = time.time()
-        self._logger.info(
-            f"ended with execution at {util.formated_time(self.end_time)} "
-            + f"on {util.formated_date(self.end_time)} local time:"
-        )
+    def run_concurrent(self):
+        """
+        executes up to self.workers independent modules at the same time, until the strategy is finished.
+        the results are merged one at a time by the main thread, so the graphs stay consistent.
+        """
 
-        self.file_manager.shutdown_server()
+        running: Dict[Future, Tuple[BufferedModuleManager, Dict, Set[Hashable]]] = {}
+        justifications = {}  # type: Dict[BufferedModuleManager, Dict]
+        busy = set()  # type: Set[Hashable]
+        # finished futures and flushed module managers, see BufferedModuleManager.flush
+        events = queue.Queue()
+        self.pending_execution = None
+        self.stopped = False
 
-        # visualization
-        generate_execution_graph_visualization(self.execution_graph, self.strategy.flags)
-        visualization_str = self.manager.gen_visualization()
-        dot = Source(visualization_str)
-        cwd = os.getcwd()
-        dot.render(os.path.join(cwd, "reports", "knowledge_graph.gv"))
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="module") as executor:
+            while True:
+                # fill the pool with the next modules of the strategy
+                for execution in self.schedule(self.workers - len(running), busy):
+                    buffered_module_manager, module, meta_key, keyed_knowledge, justification, resources = execution
+                    buffered_module_manager.flush_handler = events.put
+                    justifications[buffered_module_manager] = justification
+                    future = executor.submit(
+                        self.execute_module, module, buffered_module_manager, meta_key, keyed_knowledge
+                    )
+                    running[future] = (buffered_module_manager, justification, resources)
+                    future.add_done_callback(events.put)
 
-        generate_report(self.knowledge_graph, self.execution_graph, self.strategy.flags, f"{os.getcwd()}/reports")
+                if not running:
+                    break
 
-        duration = self.end_time - self.start_time
-        self._logger.info(f"the execution took {util.formated_duration(duration)}")
+                self.handle_event(events.get(), running, justifications, busy)
+
+    def run_async(self):
+        """
+        executes up to self.workers independent modules at the same time in an asyncio event loop,
+        until the strategy is finished. modules, that implement Module.execute_async, run in the loop,
+        all the others run in a thread pool of self.workers threads.
+        """
+
+        loop = asyncio.new_event_loop()
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="module")
+        loop.set_default_executor(executor)
+        try:
+            loop.run_until_complete(self._run_async())
+        finally:
+            loop.close()
+            executor.shutdown()
+
+    async def _run_async(self):
+        loop = asyncio.get_running_loop()
+        running: Dict[asyncio.Future, Tuple[BufferedModuleManager, Dict, Set[Hashable]]] = {}
+        justifications = {}  # type: Dict[BufferedModuleManager, Dict]
+        busy = set()  # type: Set[Hashable]
+        # finished tasks and flushed module managers, see BufferedModuleManager.flush
+        events = asyncio.Queue()
+        self.pending_execution = None
+        self.stopped = False
+
+        def flush_handler(buffered_module_manager: BufferedModuleManager):
+            # modules in the executor flush from other threads
+            loop.call_soon_threadsafe(events.put_nowait, buffered_module_manager)
+
+        while True:
+            # fill the loop with the next modules of the strategy
+            for execution in self.schedule(self.workers - len(running), busy):
+                buffered_module_manager, module, meta_key, keyed_knowledge, justification, resources = execution
+                buffered_module_manager.flush_handler = flush_handler
+                justifications[buffered_module_manager] = justification
+                task = loop.create_task(
+                    self.execute_module_async(module, buffered_module_manager, meta_key, keyed_knowledge)
+                )
+                running[task] = (buffered_module_manager, justification, resources)
+                task.add_done_callback(events.put_nowait)
+
+            if not running:
+                break
+
+            self.handle_event(await events.get(), running, justifications, busy)
+
+    def schedule(
+        self, capacity: int, busy: Set[Hashable]
+    ) -> List[Tuple[BufferedModuleManager, Module, str, Dict, Dict, Set[Hashable]]]:
+        """
+        takes the next independent module executions of the strategy and marks their resources as busy.
+        an execution, that conflicts with a running one, is kept in self.pending_execution until the
+        conflicting executions are merged.
+
+        :param capacity: the maximum number of executions to start
+        :param busy: the resources of the running executions
+        :return: a list of (buffered_module_manager, module, meta_key, keyed_knowledge, justification, resources)
+        """
+
+        executions = []
+        while not self.stopped and len(executions) < capacity:
+            if self.pending_execution is None:
+                if self.strategy.finished():
+                    self.stopped = True
+                    break
+                try:
+                    self._logger.info("strategy starts evaluating next module...")
+                    self.pending_execution = self.strategy.next()
+                except NoPriorityError:
+                    if capacity == self.workers and not executions:
+                        self._logger.info("no more modules that can be executed!")
+                        self._logger.info("stop execution")
+                        self._logger.debug(list(map(lambda e: (e.name, e.priority), self.strategy.strategy_elements)))
+                    break
+
+            module_name, module, priority, meta_key, keyed_knowledge, justification = self.pending_execution
+            resources = self.resources(module_name, module, meta_key, keyed_knowledge)
+            if resources & busy:
+                # wait until the conflicting modules are finished
+                break
+
+            self.pending_execution = None
+            busy |= resources
+            self._logger.info(f"next module is {module_name}, with priority {priority}")
+            buffered_module_manager = BufferedModuleManager(module_name, time.time(), self.deferred)
+            executions.append((buffered_module_manager, module, meta_key, keyed_knowledge, justification, resources))
+
+        return executions
+
+    def handle_event(
+        self,
+        event: Union[Future, BufferedModuleManager],
+        running: Dict[Future, Tuple[BufferedModuleManager, Dict, Set[Hashable]]],
+        justifications: Dict[BufferedModuleManager, Dict],
+        busy: Set[Hashable],
+    ):
+        """
+        merges the knowledge of a flushed or finished execution into the graphs.
+        a finished execution releases its resources.
+
+        :param event: the flushed module manager or the future of the finished execution
+        """
+
+        if isinstance(event, BufferedModuleManager):
+            # a running module flushed its buffers, see BufferedModuleManager.flush
+            self.merge(event, justifications[event], finished=False)
+            return
+
+        buffered_module_manager, justification, resources = running.pop(event)
+        del justifications[buffered_module_manager]
+        busy -= resources
+        try:
+            event.result()
+        except ModuleError:
+            self._logger.info("an error occurred in the module, ignoring")
+            self.strategy.update_all()
+        else:
+            self.merge(buffered_module_manager, justification)
+
+    def merge(self, buffered_module_manager: BufferedModuleManager, justification: Dict, finished: bool = True):
+        """
+        merges the knowledge of an execution into the graphs. an error of the merge is ignored like an error in the
+        module, so the other executions go on.
+
+        :param finished: False, if the module has only flushed its buffers
+        """
+
+        try:
+            self.manager.add_module(buffered_module_manager, justification, finished)
+        except (ValueError, TypeError):
+            self._logger.exception("an error occurred while merging the knowledge of the module, ignoring")
+            self.strategy.update_all()
+
+    @staticmethod
+    def execute_module(
+        module: Module, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict
+    ):
+        """
+        executes a module in a worker thread and stores the time, when it finished
+        """
+
+        try:
+            module.execute(buffered_module_manager, meta_key, keyed_knowledge)
+        finally:
+            buffered_module_manager.add_timestamp_end(time.time())
+
+    @staticmethod
+    async def execute_module_async(
+        module: Module, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict
+    ):
+        """
+        executes a module in the event loop and stores the time, when it finished
+        """
+
+        try:
+            await module.execute_async(buffered_module_manager, meta_key, keyed_knowledge)
+        finally:
+            buffered_module_manager.add_timestamp_end(time.time())
+
+    @staticmethod
+    def resources(
+        module_name: str, module: Module, meta_key: str, keyed_knowledge: Dict[str, Knowledge]
+    ) -> Set[Hashable]:
+        """
+        the resources, that a module execution needs exclusively.
+        two executions are independent, if they do not share any resource.
+
+        :param module_name: the name of the module
+        :param module: the module
+        :param meta_key: the metakey the module is executed with
+        :param keyed_knowledge: the knowledge the module is executed with
+        :return: a set of the ids of the used shells, unless the module and the shell can share them, and the module
+            name, if the module is not concurrent
+        """
+
+        resources = {
+            id(knowledge)
+            for knowledge in keyed_knowledge.values()
+            if isinstance(knowledge, Shell) and not (module.shares_shells and knowledge.concurrent_commands())
+        }
+        if not module.concurrent:
+            resources.add(module_name)
+        return resources | module.resources(meta_key, keyed_knowledge)
@@ -1,17 +1,38 @@
-from typing import List, Tuple, Dict
+from typing import List, Tuple, Dict, Iterable, Iterator, Optional
 from pinaht.knowledge.precondition import Precondition, MetaPrecondition
 from pinaht.knowledge.types.knowledge import Knowledge
 from itertools import product
-from pinaht.knowledge.observer_pattern import Observer, Event
+from collections import deque
+from enum import Enum
+from pinaht.knowledge.observer_pattern import Observer, Event, KnowledgeBatchEvent
+
+
+class KnowledgeAge(Enum):
+    """
+    restricts a key to the knowledge, that was already joined by a previous resolve (OLD), that is new since the
+    last resolve (NEW) or to all knowledge (ANY).
+    """
+
+    OLD = 0
+    NEW = 1
+    ANY = 2
 
 
 class Dependency(Observer):
-    def __init__(self, precondition_dnf: Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]]):
+    def __init__(
+        self,
+        precondition_dnf: Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]],
+        incremental: bool = True,
+    ):
         """
         the constructor of the Dependency class. the precondition must be in D+NF.
 
         :param precondition_dnf: a precondition D+NF, that is a disjunction of Precondition conjunctions +
                                  a metaprecondition
+        :param incremental: if True, resolve only joins groupings, that contain knowledge added since the last
+                            resolve, and keeps the satisfying groupings between calls. This needs monotonic
+                            metapreconditions (like is_parent), if any metaprecondition is not monotonic (like
+                            check_empty_child), every resolve checks all groupings again.
         """
         super(Dependency, self).__init__()
         self.precondition_dnf = precondition_dnf
@@ -23,16 +44,100 @@ class Dependency(Observer):
         }
 
         self.executed = {}
+        # the ids of the executed knowledge (in key order) per metakey
+        self.executed_ids = {meta_key: set() for meta_key in self.precondition_dnf}
         self.updated = False
 
-    def update(self, knowledge: Knowledge, only_update: bool = False):
-        for key in self.preconditions:
-            certainty = self.preconditions[key].holds(knowledge)
-            if certainty > 0.0:
+        self.incremental = incremental and all(meta.monotonic() for disjunct, meta in self.precondition_dnf.values())
+        # maps id(knowledge) to its latest (position, certainty, knowledge) in fullfilled_knowledge for every key
+        self.fullfilled_index = {key: {} for key in self.fullfilled_knowledge}
+        # number of fullfilled_knowledge entries per key, that have already been joined by resolve
+        self.watermark = {key: 0 for key in self.fullfilled_knowledge}
+        # the satisfying groupings per metakey, indexed by the ids of their knowledge (in key order)
+        self.candidates = {meta_key: {} for meta_key in self.precondition_dnf}
+        # ids of knowledge, that has been fullfilled again since the last resolve (e.g. the same enum value below
+        # a new parent), the groupings containing them must be joined again
+        self.refullfilled = set()
+        # the (parent key, child key, max depth) relations, that the metaprecondition requires
+        self.structure = {
+            meta_key: [
+                (parent_key, child_key, max_depth)
+                for parent_key, children_keys, max_depth in meta.structure()
+                for child_key in children_keys
+                if parent_key in disjunct and child_key in disjunct and not parent_key == child_key
+            ]
+            for meta_key, (disjunct, meta) in self.precondition_dnf.items()
+        }
+
+    def update(self, knowledge: Knowledge, only_update: bool = False, keys: Optional[Iterable[str]] = None):
+        """
+        update checks the preconditions for a new (or updated) knowledge.
+
+        :param keys: the keys of the preconditions to check, None checks all preconditions
+        """
+        for key in self.preconditions if keys is None else keys:
+            certainty = self.preconditions[key].certainty(knowledge)
+            if only_update and self.recheck(key, knowledge, certainty):
+                self.updated = True
+            elif certainty > 0.0:
                 if not only_update:
+                    if id(knowledge) in self.fullfilled_index[key]:
+                        self.refullfilled.add(id(knowledge))
+                    self.fullfilled_index[key][id(knowledge)] = (
+                        len(self.fullfilled_knowledge[key]),
+                        certainty,
+                        knowledge,
+                    )
                     self.fullfilled_knowledge[key].append((certainty, knowledge))
                 self.updated = True
 
+    def update_batch(self, batch: List[Tuple[Knowledge, Optional[Iterable[str]]]], only_update: bool = False):
+        """
+        update_batch checks the preconditions for many new (or updated) knowledge at once.
+
+        :param batch: the knowledge with the keys of the preconditions to check, see update
+        """
+        # the knowledge to check for each key, so every precondition checks its knowledge in one pass
+        keyed_knowledge = {}  # type: Dict[str, List[Knowledge]]
+        for knowledge, keys in batch:
+            for key in self.preconditions if keys is None else keys:
+                if key in keyed_knowledge:
+                    keyed_knowledge[key].append(knowledge)
+                else:
+                    keyed_knowledge[key] = [knowledge]
+
+        for key, knowledge_list in keyed_knowledge.items():
+            certainties = self.preconditions[key].holds_batch(knowledge_list)
+            fullfilled_knowledge = self.fullfilled_knowledge[key]
+            fullfilled_index = self.fullfilled_index[key]
+            for certainty, knowledge in zip(certainties, knowledge_list):
+                if only_update and self.recheck(key, knowledge, certainty):
+                    self.updated = True
+                elif certainty > 0.0:
+                    if not only_update:
+                        if id(knowledge) in fullfilled_index:
+                            self.refullfilled.add(id(knowledge))
+                        fullfilled_index[id(knowledge)] = (len(fullfilled_knowledge), certainty, knowledge)
+                        fullfilled_knowledge.append((certainty, knowledge))
+                    self.updated = True
+
+    def recheck(self, key: str, knowledge: Knowledge, certainty: float) -> bool:
+        """
+        recheck fullfills an updated knowledge, that has been fullfilled before, again with its new certainty. the
+        next resolve joins the groupings containing it again, like for knowledge fullfilled again below a new parent.
+        a certainty of 0.0 removes them.
+
+        :return: True, if the knowledge has been fullfilled for the key before
+        """
+        fullfilled_index = self.fullfilled_index[key]
+        if id(knowledge) not in fullfilled_index:
+            return False
+
+        self.refullfilled.add(id(knowledge))
+        fullfilled_index[id(knowledge)] = (len(self.fullfilled_knowledge[key]), certainty, knowledge)
+        self.fullfilled_knowledge[key].append((certainty, knowledge))
+        return True
+
     def resolve(self) -> List[Tuple[str, float, Dict[str, Tuple[float, Knowledge]]]]:
         """
         resolve is a methode, that checks with knowledge groupings satisfy the hole precondition D+NF
@@ -41,6 +146,170 @@ class Dependency(Observer):
                  executed. The grouping is the metakey, a certainty of the metaprecondition and the dict of
                  (certainty, knowledge) pairs for each precondition (key).
         """
+        if not self.incremental:
+            return self.resolve_all()
+
+        satisfies_conjunct = []
+        for meta_key, (disjunct, meta) in self.precondition_dnf.items():
+            key_list = [key for key in disjunct]
+            candidates = self.candidates[meta_key]
+            if self.refullfilled:
+                for ids in [ids for ids in candidates if not self.refullfilled.isdisjoint(ids)]:
+                    del candidates[ids]
+
+            # semi-naive join: every new grouping contains at least one new knowledge. The i-th join takes the
+            # new knowledge of the i-th key, the old knowledge of all keys before and all knowledge of the keys
+            # after it, thus every new grouping is generated exactly once.
+            for i, new_key in enumerate(key_list):
+                if self.watermark[new_key] == len(self.fullfilled_knowledge[new_key]):
+                    continue
+                ages = {key: KnowledgeAge.OLD if j < i else KnowledgeAge.ANY for j, key in enumerate(key_list)}
+                ages[new_key] = KnowledgeAge.NEW
+
+                for key_grouping in self.join(meta_key, key_list, ages, new_key):
+                    ids = tuple(id(key_grouping[key][1]) for key in key_list)
+                    if ids in self.executed_ids[meta_key]:
+                        continue
+
+                    keyed_knowledge = {key: knowledge for key, (certainty, knowledge) in key_grouping.items()}
+                    certainty = meta.holds(**keyed_knowledge)
+                    if certainty > 0.0:
+                        candidates[ids] = (certainty, key_grouping)
+
+            # executed groupings are removed by add_executed
+            for ids, (certainty, key_grouping) in candidates.items():
+                satisfies_conjunct.append((meta_key, certainty, dict(key_grouping)))
+
+        for key in self.watermark:
+            self.watermark[key] = len(self.fullfilled_knowledge[key])
+        self.refullfilled.clear()
+
+        return satisfies_conjunct
+
+    def plan(self, meta_key: str, key_list: List[str], start_key: str) -> List[Tuple[str, Optional[Tuple]]]:
+        """
+        plan orders the keys for the join. Every key, that is related to an earlier key by the structure of the
+        metaprecondition, is bound by walking the knowledge graph from the knowledge of the earlier key.
+
+        :return: a list of (key, source) pairs. The source is None or (earlier key, downwards, max depth).
+        """
+        planned = {}
+        while len(planned) < len(key_list):
+            if start_key in planned:
+                # the next unrelated key, preferably a root of the structure
+                children = {child_key for parent_key, child_key, max_depth in self.structure[meta_key]}
+                unplanned = [key for key in key_list if key not in planned]
+                roots = [key for key in unplanned if key not in children]
+                start_key = roots[0] if roots else unplanned[0]
+
+            planned[start_key] = None
+            queue = deque([start_key])
+            while queue:
+                key = queue.popleft()
+                for parent_key, child_key, max_depth in self.structure[meta_key]:
+                    if parent_key == key and child_key not in planned:
+                        planned[child_key] = (key, True, max_depth)
+                        queue.append(child_key)
+                    elif child_key == key and parent_key not in planned:
+                        planned[parent_key] = (key, False, max_depth)
+                        queue.append(parent_key)
+
+        return list(planned.items())
+
+    def join(
+        self, meta_key: str, key_list: List[str], ages: Dict[str, KnowledgeAge], start_key: str
+    ) -> Iterator[Dict[str, Tuple[float, Knowledge]]]:
+        """
+        join generates the groupings of fullfilled knowledge, that satisfy the structure of the metaprecondition.
+
+        :param ages: restricts the knowledge of each key, see KnowledgeAge
+        :param start_key: the key the join starts with
+        :return: an iterator of {key: (certainty, knowledge)} groupings
+        """
+        plan = self.plan(meta_key, key_list, start_key)
+        key_grouping = {}
+
+        def visit(i: int):
+            if i == len(plan):
+                yield {key: key_grouping[key] for key in key_list}
+                return
+            key, source = plan[i]
+            for certainty_knowledge in self.join_candidates(key, ages[key], source, key_grouping):
+                key_grouping[key] = certainty_knowledge
+                yield from visit(i + 1)
+            key_grouping.pop(key, None)
+
+        return visit(0)
+
+    def join_candidates(
+        self,
+        key: str,
+        age: KnowledgeAge,
+        source: Optional[Tuple[str, bool, int]],
+        key_grouping: Dict[str, Tuple[float, Knowledge]],
+    ) -> Iterator[Tuple[float, Knowledge]]:
+        index = self.fullfilled_index[key]
+        watermark = self.watermark[key]
+
+        if source is not None:
+            source_key, downwards, max_depth = source
+            related = self.related_knowledge(key_grouping[source_key][1], downwards, max_depth)
+            entries = (index[id(knowledge)] for knowledge in related if id(knowledge) in index)
+        elif age == KnowledgeAge.NEW:
+            # the new knowledge in the order it has been fullfilled, skipping knowledge fullfilled again later on
+            fullfilled = self.fullfilled_knowledge[key]
+            entries = [index[id(knowledge)] for certainty, knowledge in fullfilled[watermark:]]
+            entries = [entry for position, entry in enumerate(entries, watermark) if entry[0] == position]
+        else:
+            entries = list(index.values())
+
+        for position, certainty, knowledge in entries:
+            if certainty <= 0.0:
+                # the knowledge does not fullfill the precondition anymore since an update
+                continue
+            if age == KnowledgeAge.OLD and position >= watermark:
+                continue
+            if age == KnowledgeAge.NEW and position < watermark:
+                continue
+            yield certainty, knowledge
+
+    @staticmethod
+    def related_knowledge(knowledge: Knowledge, downwards: bool, max_depth: int) -> Iterator[Knowledge]:
+        """
+        related_knowledge walks the knowledge graph starting with the given knowledge.
+
+        :param downwards: if True the descendants are walked (by their lookup), else the ancestors
+        :return: the knowledge itself and its descendants/ancestors up to max_depth
+        """
+        if not downwards:
+            yield knowledge
+            for i in range(max_depth):
+                if knowledge.parent is None:
+                    return
+                knowledge = knowledge.parent
+                yield knowledge
+            return
+
+        level = [knowledge]
+        visited = {id(knowledge)}
+        yield knowledge
+        for i in range(max_depth):
+            next_level = []
+            for parent in level:
+                for children_list in parent.lookup.values():
+                    for child in children_list:
+                        if id(child) not in visited:
+                            visited.add(id(child))
+                            next_level.append(child)
+                            yield child
+            level = next_level
+
+    def resolve_all(self) -> List[Tuple[str, float, Dict[str, Tuple[float, Knowledge]]]]:
+        """
+        resolve_all checks every grouping of the fullfilled knowledge again, see resolve.
+
+        :return: the satisfying groupings, see resolve
+        """
 
         # maps for each metaprecondition the set of keys, corresponding to the precondition, that must satisfy the
         # metaprecondition
@@ -52,8 +321,17 @@ class Dependency(Observer):
         satisfies_conjunct = []
         for meta_key, (meta, key_list) in meta_precondition_key_list.items():
             # calc the cross-product of the fullfilling knowledges for the given metaprecondition
-            # extract the knowledge
-            knowledge_and_certainty_group_list = product(*map(lambda key: self.fullfilled_knowledge[key], key_list))
+            # extract the knowledge with its latest certainty, that still fullfills the precondition
+            knowledge_and_certainty_group_list = product(
+                *map(
+                    lambda key: [
+                        (certainty, knowledge)
+                        for position, certainty, knowledge in self.fullfilled_index[key].values()
+                        if certainty > 0.0
+                    ],
+                    key_list,
+                )
+            )
 
             # for every grouping (aka world) check the certainty of fulfillment of the metaprecondition
             for grouping in knowledge_and_certainty_group_list:
@@ -63,21 +341,7 @@ class Dependency(Observer):
                 keyed_knowledge = {key: knowledge for key, knowledge in knowledge_list}
 
                 # checks if the pair has already been executed in a previous run
-                has_been_executed = False
-                if meta_key in self.executed:
-                    for executed_keyed_knowledge in self.executed[meta_key]:
-                        assert len(executed_keyed_knowledge) == len(keyed_knowledge)
-                        # executed_keyed_knowledge == keyed_knowledge?
-                        equals = True
-                        for key in key_list:
-                            if not id(keyed_knowledge[key]) == id(executed_keyed_knowledge[key]):
-                                equals = False
-                                break
-                        if equals:
-                            has_been_executed = True
-                            break
-
-                if not has_been_executed:
+                if not self.has_been_executed(meta_key, keyed_knowledge):
                     # call metaprecondition holds with the arguments
                     certainty = meta.holds(**keyed_knowledge)
                 else:
@@ -91,8 +355,19 @@ class Dependency(Observer):
 
         return satisfies_conjunct
 
+    def executed_key(self, meta_key: str, keyed_knowledge: Dict[str, Knowledge]) -> Tuple[int, ...]:
+        """
+        :return: the ids of the keyed knowledge in the order of the precondition keys of the metakey
+        """
+        return tuple(id(keyed_knowledge[key]) for key in self.precondition_dnf[meta_key][0])
+
+    def has_been_executed(self, meta_key: str, keyed_knowledge: Dict[str, Knowledge]) -> bool:
+        return self.executed_key(meta_key, keyed_knowledge) in self.executed_ids[meta_key]
+
     def notify(self, observable, event: Event):
-        if isinstance(event.knowledge, Knowledge):
+        if isinstance(event, KnowledgeBatchEvent):
+            self.update_batch(list(event.items()), event.only_update)
+        elif isinstance(event.knowledge, Knowledge):
             self.update(event.knowledge, event.only_update)
 
     def add_executed(self, meta_key: str, keyed_knowledge: Dict[str, Knowledge]):
@@ -100,4 +375,8 @@ class Dependency(Observer):
             self.executed[meta_key] = [keyed_knowledge]
         else:
             self.executed[meta_key].append(keyed_knowledge)
+
+        ids = self.executed_key(meta_key, keyed_knowledge)
+        self.executed_ids[meta_key].add(ids)
+        self.candidates[meta_key].pop(ids, None)
         self.updated = True
@@ -1,16 +1,40 @@
 from pinaht.knowledge.types.knowledge import Knowledge, RootKnowledge
 from pinaht.knowledge.precondition import Precondition, MetaPrecondition
-from typing import Tuple, Dict, Callable, Iterable, List
-import pinaht.util as util
-from itertools import product
-import numpy as np
+from pinaht.knowledge.types.name import Name
+from pinaht.knowledge.types.port import Port
+from pinaht.knowledge.types.ipaddress import IPAddress
+from typing import Tuple, Dict, Callable, Iterable, List, Optional, Hashable, Iterator
+from itertools import islice
+from collections import deque
+import heapq
+
+# the knowledge types, that are indexed by their value, and the type of the value
+VALUE_INDEXED_TYPES = {Name: str, Port: int, IPAddress: int}
+
+# scores the certainty of the metaprecondition and the certainties of the preconditions of a grouping
+Evaluation = Callable[[Tuple[float, Dict[str, float]]], float]
+
+
+def min_evaluation(T: Tuple[float, Dict[str, float]]) -> float:  # noqa N803
+    """
+    the default evaluation of KnowledgeGraph.query: the certainty of the metaprecondition
+    times the minimum certainty of the preconditions
+    """
+    return T[0] * min(T[1].values())
 
 
 class KnowledgeGraph:
     def __init__(self):
         self.root = RootKnowledge()
-        self.changed = True
-        self.bfs_catch = None
+        # every knowledge of the graph in the order it has been added, see flatten
+        self.knowledge = [self.root]  # type: List[Knowledge]
+        self.knowledge_ids = {id(self.root)}
+        # maps the class of the knowledge to the knowledge, see instances
+        self.type_index = {RootKnowledge: [self.root]}  # type: Dict[type, List[Knowledge]]
+        # maps the id of a knowledge to its parents and the keys it has been added with, see parents
+        self.parent_index = {}  # type: Dict[int, List[Tuple[Knowledge, str]]]
+        # maps the value indexed types to the values of their knowledge, see find
+        self.value_index: Dict[type, Dict[Hashable, List[Knowledge]]] = {t: {} for t in VALUE_INDEXED_TYPES}
 
     def add_knowledge(self, parent: Knowledge, key: str, knowledge: Knowledge):
         if parent is None:
@@ -19,69 +43,261 @@ class KnowledgeGraph:
         else:
             knowledge.parent = parent
             parent.add_child(key, knowledge)
-        self.changed = True
+        self.index(knowledge.parent, key, knowledge)
+
+    def replace_knowledge(self, parent: Knowledge, key: str, knowledge: Knowledge) -> Knowledge:
+        """
+        replaces the SINGLETON child of the parent with the knowledge, see Knowledge.replace_child.
+
+        :return: the replaced knowledge
+        """
+        replaced = parent.replace_child(key, knowledge)
+        self.remove(parent, key, replaced)
+        self.index(parent, key, knowledge)
+        return replaced
+
+    def remove(self, parent: Knowledge, key: str, knowledge: Knowledge):
+        """
+        removes the knowledge as the child of the parent from the indexes. knowledge without other parents is
+        removed from the graph together with its subtree.
+        """
+        parents = self.parent_index.get(id(knowledge), [])
+        parents[:] = [(p, k) for p, k in parents if not (p is parent and k == key)]
+        if parents or id(knowledge) not in self.knowledge_ids:
+            return
+
+        del self.parent_index[id(knowledge)]
+        self.unregister(knowledge)
+        for child_parent, child_key, child in child_edges(knowledge):
+            self.remove(child_parent, child_key, child)
+
+    def index(self, parent: Knowledge, key: str, knowledge: Knowledge):
+        """
+        adds the knowledge and its children, that are not in the graph yet, to the indexes.
+        knowledge can already have children, when it is added (e.g. Target(address=ip)).
+        """
+        self.parent_index.setdefault(id(knowledge), []).append((parent, key))
+        if id(knowledge) in self.knowledge_ids:
+            # the children of knowledge, that is added again, can be new
+            queue = deque(edge for edge in child_edges(knowledge) if id(edge[2]) not in self.knowledge_ids)
+        else:
+            self.register(knowledge)
+            queue = deque(child_edges(knowledge))
+
+        while queue:
+            parent, key, u = queue.popleft()
+            self.parent_index.setdefault(id(u), []).append((parent, key))
+            if id(u) not in self.knowledge_ids:
+                self.register(u)
+                queue.extend(child_edges(u))
+
+    def register(self, knowledge: Knowledge):
+        self.knowledge_ids.add(id(knowledge))
+        self.knowledge.append(knowledge)
+        self.type_index.setdefault(type(knowledge), []).append(knowledge)
+        for knowledge_type, value_type in VALUE_INDEXED_TYPES.items():
+            if isinstance(knowledge, knowledge_type):
+                self.value_index[knowledge_type].setdefault(value_type(knowledge), []).append(knowledge)
+
+    def unregister(self, knowledge: Knowledge):
+        def remove_identical(knowledge_list: List[Knowledge]):
+            # knowledge can be equal to other knowledge with the same value
+            for i, other in enumerate(knowledge_list):
+                if other is knowledge:
+                    del knowledge_list[i]
+                    return
+
+        self.knowledge_ids.discard(id(knowledge))
+        remove_identical(self.knowledge)
+        remove_identical(self.type_index.get(type(knowledge), []))
+        for knowledge_type, value_type in VALUE_INDEXED_TYPES.items():
+            if isinstance(knowledge, knowledge_type):
+                remove_identical(self.value_index[knowledge_type].get(value_type(knowledge), []))
+
+    def instances(self, knowledge_type: type) -> List[Knowledge]:
+        """
+        :return: every knowledge of the graph, that is an instance of the type
+        """
+        return [
+            knowledge
+            for indexed_type, knowledge_list in self.type_index.items()
+            if issubclass(indexed_type, knowledge_type)
+            for knowledge in knowledge_list
+        ]
+
+    def parents(self, knowledge: Knowledge) -> List[Tuple[Knowledge, str]]:
+        """
+        :return: the parents of the knowledge and the keys it is a child with, e.g. for enum knowledge several
+        """
+        return self.parent_index.get(id(knowledge), [])
+
+    def find(self, knowledge_type: type, value: Hashable) -> List[Knowledge]:
+        """
+        :param knowledge_type: a type of VALUE_INDEXED_TYPES
+        :return: the knowledge of the type with the value, e.g. find(Name, "OpenSSH")
+        """
+        return self.value_index[knowledge_type].get(VALUE_INDEXED_TYPES[knowledge_type](value), [])
+
+    def values(self, knowledge_type: type) -> Dict[Hashable, List[Knowledge]]:
+        """
+        :param knowledge_type: a type of VALUE_INDEXED_TYPES
+        :return: the knowledge of the type by its value, e.g. to search for substrings of names
+        """
+        return self.value_index[knowledge_type]
+
+    def candidates(self, precondition: Precondition) -> List[Knowledge]:
+        """
+        :return: the knowledge, that can fulfill the precondition, see Precondition.accepted_types
+        """
+        if precondition.accepted_types is None:
+            return self.flatten()
+
+        candidates = {}
+        for accepted_type in precondition.accepted_types:
+            for knowledge in self.instances(accepted_type):
+                candidates[id(knowledge)] = knowledge
+        return list(candidates.values())
+
+    def flatten(self) -> List[Knowledge]:
+        """
+        :return: every knowledge of the graph, without traversing it
+        """
+        return self.knowledge
 
     def query(
         self,
         q: Tuple[Dict[str, Precondition], MetaPrecondition],
-        evaluation: Callable[[float, dict], float] = lambda T: T[0] * min([value for name, value in T[1].items()]),
-        choose_function: Callable[[Iterable], int] = lambda I: np.argmax(I),  # noqa: E741
-    ):
-
-        bfs_flatted_knowledge = self.bfs(
-            self.root, lambda u: util.list_flatt([entry for name, entry in u.lookup.items()])
-        )
-        preconditions, meterprecondition = q
-        precondition_catch = {name: [] for name in preconditions}
-        precondition_names = [name for name in preconditions]
-
-        for k in bfs_flatted_knowledge:
-            for name, prec in preconditions.items():
-                if prec.holds(k) > 0:
-                    precondition_catch[name].append(k)
-
-        list_of_kwargs = list(
-            map(
-                lambda T: {precondition_names[i]: T[i] for i in range(len(T))},
-                product(*map(lambda p: precondition_catch[p], precondition_catch)),
-            )
-        )
-
-        position = choose_function(
-            map(
-                evaluation,
-                zip(
-                    [meterprecondition.holds(**kwargs) for kwargs in list_of_kwargs],
-                    [
-                        {name: preconditions[name].holds(value) for name, value in kwargs.items()}
-                        for kwargs in list_of_kwargs
-                    ],
-                ),
-            )
-        )
-
-        return list_of_kwargs[position]
-
-    def bfs(self, start: Knowledge, next: Callable[[Knowledge], Iterable[Knowledge]]) -> List[Knowledge]:
-        if not self.changed:
-            return self.bfs_catch
-
-        Q = []  # noqa N806
+        evaluation: Optional[Evaluation] = None,
+        choose_function: Optional[Callable[[Iterable], int]] = None,
+    ) -> Optional[Dict[str, Knowledge]]:
+        """
+        :param q: the preconditions and the metaprecondition of the grouping
+        :param evaluation: scores the certainty of the metaprecondition and the certainties of the preconditions
+        :param choose_function: chooses the position of the best score, evaluates every grouping if given
+        :return: the best grouping or None if there is none
+        """
+        evaluation = min_evaluation if evaluation is None else evaluation
+
+        if choose_function is not None:
+            groupings = list(self.query_iter(q, evaluation))
+            if not groupings:
+                return None
+            return groupings[choose_function([score for score, grouping in groupings])][1]
+
+        best = self.query_top(q, 1, evaluation)
+        return best[0][1] if best else None
+
+    def query_iter(
+        self,
+        q: Tuple[Dict[str, Precondition], MetaPrecondition],
+        evaluation: Optional[Evaluation] = None,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tuple[float, Dict[str, Knowledge]]]:
+        """
+        yields the groupings lazily, so only one grouping is in memory at a time
+
+        :param limit: the maximum number of groupings
+        :return: the score and the grouping
+        """
+        evaluation = min_evaluation if evaluation is None else evaluation
+        return islice(self.search(q, evaluation, lambda: None), limit)
+
+    def query_top(
+        self,
+        q: Tuple[Dict[str, Precondition], MetaPrecondition],
+        k: int,
+        evaluation: Optional[Evaluation] = None,
+    ) -> List[Tuple[float, Dict[str, Knowledge]]]:
+        """
+        selects the k best groupings. with min_evaluation, partial groupings, that can not be better than the k
+        best groupings so far, are pruned (branch and bound). of equal groupings the first ones are chosen.
+
+        :return: the score and the grouping of the k best groupings, the best first
+        """
+        evaluation = min_evaluation if evaluation is None else evaluation
+        prune = evaluation is min_evaluation
+        heap = []  # type: List[Tuple[float, int, Dict[str, Knowledge]]]
+
+        def threshold() -> Optional[float]:
+            return heap[0][0] if prune and len(heap) == k else None
+
+        for position, (score, grouping) in enumerate(self.search(q, evaluation, threshold)):
+            # the score and the position decide, so the groupings are never compared
+            if len(heap) < k:
+                heapq.heappush(heap, (score, -position, grouping))
+            else:
+                heapq.heappushpop(heap, (score, -position, grouping))
+
+        return [(score, grouping) for score, position, grouping in sorted(heap, reverse=True)]
+
+    def search(
+        self,
+        q: Tuple[Dict[str, Precondition], MetaPrecondition],
+        evaluation: Evaluation,
+        threshold: Callable[[], Optional[float]],
+    ) -> Iterator[Tuple[float, Dict[str, Knowledge]]]:
+        """
+        yields the groupings depth first. the knowledge of each precondition is tried in descending certainty,
+        a partial grouping is pruned if the minimum of its certainties is not above the threshold.
+        """
+        preconditions, metaprecondition = q
+        names = list(preconditions)
+        matches = []
+        for name in names:
+            certainties = [(preconditions[name].certainty(k), k) for k in self.candidates(preconditions[name])]
+            matches.append(sorted([match for match in certainties if match[0] > 0], key=lambda m: -m[0]))
+
+        grouping = {}
+        certainties = {}
+
+        def extend(i: int, bound: float):
+            if i == len(names):
+                yield evaluation((metaprecondition.holds(**grouping), dict(certainties))), dict(grouping)
+                return
+
+            name = names[i]
+            for certainty, knowledge in matches[i]:
+                t = threshold()
+                if t is not None and min(bound, certainty) <= t:
+                    # the remaining knowledge has a lower certainty
+                    break
+                grouping[name] = knowledge
+                certainties[name] = certainty
+                yield from extend(i + 1, min(bound, certainty))
+            grouping.pop(name, None)
+            certainties.pop(name, None)
+
+        return extend(0, float("inf"))
+
+    def bfs(
+        self, start: Knowledge, next: Optional[Callable[[Knowledge], Iterable[Knowledge]]] = None
+    ) -> List[Knowledge]:
+        """
+        traverses the graph from start, use flatten for the whole graph.
+
+        :param next: the neighbours of a knowledge, the children by default
+        :return: the reached knowledge in breadth first order
+        """
+        next = children if next is None else next
+
+        Q = deque([start])  # noqa N806
         L = []  # noqa N806
-        start.color = "g"
-        Q.append(start)
+        visited = {id(start)}
 
         while Q:
-            u = Q.pop(0)
+            u = Q.popleft()
             L.append(u)
-            u.color = "b"
             for v in next(u):
-                if v.color == "w":
-                    v.color = "g"
+                if id(v) not in visited:
+                    visited.add(id(v))
                     Q.append(v)
 
-        for v in L:
-            v.color = "w"
-
-        self.bfs_catch = L
         return L
+
+
+def child_edges(knowledge: Knowledge) -> List[Tuple[Knowledge, str, Knowledge]]:
+    return [(knowledge, key, child) for key, children_list in knowledge.lookup.items() for child in children_list]
+
+
+def children(knowledge: Knowledge) -> List[Knowledge]:
+    return [child for children_list in knowledge.lookup.values() for child in children_list]
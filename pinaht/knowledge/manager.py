@@ -1,27 +1,44 @@
-from typing import Tuple, Dict
-from pinaht.knowledge.precondition import Precondition, MetaPrecondition
+from typing import Tuple, Dict, List, Callable, Optional
+from pinaht.knowledge.precondition import Precondition, MetaPrecondition, precondition_cache
+from pinaht.knowledge.dependency import Dependency
 from pinaht.knowledge import knowledge_graph as kg
 from pinaht.knowledge import execution_graph as eg
 from pinaht.knowledge.duality_edge import DualityEdge, DualityEdgeType
-from pinaht.knowledge.types.knowledge import Knowledge
-from pinaht.knowledge.observer_pattern import Observable, Event
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON
+from pinaht.knowledge.observer_pattern import Observable, Observer, KnowledgeBatchEvent
 import numpy as np
-import functools as ft
 import jinja2 as ji2
 import string
 import logging
+import threading
+from collections import deque
 from pinaht.knowledge.types.generate import get_types_obj, check_model_consistency
 import os
 
 
 class BufferedModuleManager:
-    def __init__(self, module_name: str, timestamp_start: float):
+    def __init__(self, module_name: str, timestamp_start: float, deferred: bool = False):
+        """
+        :param deferred: if True, the observers are notified about flushed knowledge only when the module is
+                         finished, all events of the execution are sent coalesced
+        """
         self.node = eg.Node(module_name, ["Module not finished"], timestamp_start, np.inf)
         self.add_knowledge_buffer = []
         self.update_knowledge_buffer = []
+        self.executed_buffer = []
         self.log_list = []
         self._logger = logging.getLogger(f"{self.__class__.__name__!s}_{module_name!s}")
 
+        # called by flush, set by the application if it merges knowledge before the module is finished
+        self.flush_handler: Optional[Callable[["BufferedModuleManager"], None]] = None
+        # whether the node has already been added to the execution graph
+        self.merged = False
+        self.lock = threading.Lock()
+        # the events of the flushed knowledge, if they are held back until the module is finished, see add_module
+        self.deferred_events = [] if deferred else None
+        # maps the ids of merged knowledge to the knowledge and the child it is merged into, see merge_knowledge
+        self.merged_knowledge = {}  # type: Dict[int, Tuple[Knowledge, Knowledge]]
+
     def report(self, input: str):
         self._logger.debug(f"{input}")
         self.log_list.append(input)
@@ -35,13 +52,43 @@ class BufferedModuleManager:
         if certainty < 0.0 or certainty > 1.0:
             raise ValueError("certainty must be in interval [0,1]")
 
-        self.add_knowledge_buffer.append((parent, key, knowledge, certainty, recursive))
+        with self.lock:
+            self.add_knowledge_buffer.append((parent, key, knowledge, certainty, recursive))
 
     def update_knowledge(self, knowledge: Knowledge, certainty: float):
         if certainty < 0.0 or certainty > 1.0:
             raise ValueError("certainty must be in interval [0,1]")
 
-        self.update_knowledge_buffer.append((knowledge, certainty))
+        with self.lock:
+            self.update_knowledge_buffer.append((knowledge, certainty))
+
+    def add_executed(self, dependency: Dependency, meta_key: str, keyed_knowledge: Dict[str, Knowledge]):
+        """
+        marks a grouping of a dependency as executed, e.g. if the module has done the work of another module.
+        the grouping is marked before the knowledge of the same merge is added.
+        """
+        with self.lock:
+            self.executed_buffer.append((dependency, meta_key, keyed_knowledge))
+
+    def flush(self):
+        """
+        hands the buffered knowledge over to the application before the module is finished,
+        so other modules can already use it. without a flush handler the knowledge stays buffered.
+        """
+        if self.flush_handler is not None:
+            self.flush_handler(self)
+
+    def take_buffers(self) -> Tuple[List, List, List]:
+        """
+        empties the buffers
+
+        :return: the buffered knowledge to add and to update and the executed groupings
+        """
+        with self.lock:
+            add_knowledge_buffer, self.add_knowledge_buffer = self.add_knowledge_buffer, []
+            update_knowledge_buffer, self.update_knowledge_buffer = self.update_knowledge_buffer, []
+            executed_buffer, self.executed_buffer = self.executed_buffer, []
+        return add_knowledge_buffer, update_knowledge_buffer, executed_buffer
 
 
 class Manager(Observable):
@@ -49,6 +96,59 @@ class Manager(Observable):
         super(Manager, self).__init__()
         self.knowledge_graph = knowledge_graph
         self.execution_graph = execution_graph
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+        # maps the accepted types of the preconditions to their (dependency, key), see Precondition.accepted_types
+        self.type_index = {}  # type: Dict[type, List[Tuple[Dependency, str]]]
+        # (dependency, key) of the preconditions, that accept any knowledge
+        self.untyped_index = []  # type: List[Tuple[Dependency, str]]
+        # maps a knowledge type to the keys to check for each dependency
+        self.dispatch_cache = {}  # type: Dict[type, Dict[Dependency, List[str]]]
+
+    def register(self, observer: Observer):
+        if observer in self.observers:
+            return
+        super(Manager, self).register(observer)
+
+        if isinstance(observer, Dependency):
+            for key, precondition in observer.preconditions.items():
+                if precondition.accepted_types is None:
+                    self.untyped_index.append((observer, key))
+                else:
+                    for accepted_type in precondition.accepted_types:
+                        self.type_index.setdefault(accepted_type, []).append((observer, key))
+            self.dispatch_cache.clear()
+
+    def remove(self, observer: Observer):
+        super(Manager, self).remove(observer)
+
+        if isinstance(observer, Dependency):
+            self.type_index = {
+                accepted_type: [(dependency, key) for dependency, key in entries if dependency is not observer]
+                for accepted_type, entries in self.type_index.items()
+            }
+            self.untyped_index = [
+                (dependency, key) for dependency, key in self.untyped_index if dependency is not observer
+            ]
+            self.dispatch_cache.clear()
+
+    def dispatch(self, knowledge_type: type) -> Dict[Dependency, List[str]]:
+        """
+        dispatch looks up the preconditions, that can accept knowledge of the given type.
+
+        :return: a dict of the dependencies and the keys of their preconditions to check
+        """
+        if knowledge_type not in self.dispatch_cache:
+            entries = [entry for cls in knowledge_type.__mro__ for entry in self.type_index.get(cls, [])]
+            entries += self.untyped_index
+
+            dispatch = {}
+            for dependency, key in entries:
+                keys = dispatch.setdefault(dependency, [])
+                if key not in keys:
+                    keys.append(key)
+            self.dispatch_cache[knowledge_type] = dispatch
+        return self.dispatch_cache[knowledge_type]
 
     def add_knowledge(self, parent: Knowledge, key: str, knowledge: Knowledge, eq_certainty: float = 1.0):
         self.knowledge_graph.add_knowledge(parent, key, knowledge)
@@ -84,60 +184,179 @@ class Manager(Observable):
         if certainty < 0.0 or certainty > 1.0:
             raise ValueError("certainty must be in interval [0,1]")
 
-        duality_edge = DualityEdge(knowledge, node, certainty, duality_edge_type)
-        node.add_duality_edge(duality_edge)
-        knowledge.add_duality_edge(duality_edge)
+        # the edge adds itself to the knowledge and the node
+        DualityEdge(knowledge, node, certainty, duality_edge_type)
+        if duality_edge_type == DualityEdgeType.UPDATE:
+            precondition_cache.invalidate(knowledge)
 
     def add_module(
         self,
         module_manager: BufferedModuleManager,
         justification: Tuple[str, MetaPrecondition, Dict[str, Tuple[Precondition, eg.Node, Knowledge]]],
+        finished: bool = True,
     ):
-        self.add_node(module_manager.node, justification)
+        """
+        merges the buffered knowledge of a module into the graphs and sends the events of the merge coalesced.
+
+        :param finished: False, if the module is still running and has only flushed its buffers. the events of a
+                         module manager with deferred events are held back until the module is finished.
+        """
+        # a flushed module manager is merged several times, but its node is only added once
+        if not module_manager.merged:
+            self.add_node(module_manager.node, justification)
+            module_manager.merged = True
 
         # add doc
         module_manager.node.module_doc = module_manager.log_list
 
-        # add knowledge
-        for (parent, key, knowledge, certainty, recursive) in module_manager.add_knowledge_buffer:
-            if recursive:
-
-                def recursive_get_children(knowledge):
-                    temp_children = [
-                        (knowledge, key, children)
-                        for key, children_list in knowledge.lookup.items()
-                        for children in children_list
-                    ]
-                    recursive_children = ft.reduce(
-                        lambda A, B: A + B,
-                        [recursive_get_children(knowledge) for parent, key, knowledge in temp_children],
-                        [],
-                    )
-                    return temp_children + recursive_children
+        add_knowledge_buffer, update_knowledge_buffer, executed_buffer = module_manager.take_buffers()
 
-                recursive_knowledge = [(parent, key, knowledge)] + recursive_get_children(knowledge)
-                # adds the parent into the tree thus "building the bridge"
-                self.add_knowledge(parent, key, knowledge)
-                for parent, key, knowledge in recursive_knowledge:
-                    # for all new added knowledge the duality edge must be drawn and the modules need to be notified
-                    self.draw_duality_edge(knowledge, module_manager.node, certainty, DualityEdgeType.ADD)
-                    self.notify(knowledge)
+        with self.hold_events() as events:
+            # mark executed groupings
+            for dependency, meta_key, keyed_knowledge in executed_buffer:
+                dependency.add_executed(meta_key, keyed_knowledge)
 
-            else:
-                self.add_knowledge(parent, key, knowledge)
-                self.draw_duality_edge(knowledge, module_manager.node, certainty, DualityEdgeType.ADD)
-                self.notify(knowledge)
+            self.add_knowledge_batch(add_knowledge_buffer, module_manager.node, module_manager.merged_knowledge)
+
+            # update knowledge, merged knowledge is updated in the child it is merged into
+            update_knowledge_buffer = [
+                (module_manager.merged_knowledge.get(id(knowledge), (None, knowledge))[1], certainty)
+                for knowledge, certainty in update_knowledge_buffer
+            ]
+            for knowledge, certainty in update_knowledge_buffer:
+                self.draw_duality_edge(knowledge, module_manager.node, certainty, DualityEdgeType.UPDATE)
+            self.notify_batch([knowledge for knowledge, certainty in update_knowledge_buffer], True)
+
+        if module_manager.deferred_events is not None and not finished:
+            module_manager.deferred_events.extend(events)
+        else:
+            if module_manager.deferred_events:
+                events, module_manager.deferred_events = module_manager.deferred_events + events, []
+            self.send_events(events)
 
-        # update knowledge
-        for (knowledge, certainty) in module_manager.update_knowledge_buffer:
-            self.draw_duality_edge(knowledge, module_manager.node, certainty, DualityEdgeType.UPDATE)
-            self.notify(knowledge, True)
+    def add_knowledge_batch(
+        self,
+        add_knowledge_buffer: List[Tuple[Knowledge, str, Knowledge, float, bool]],
+        node: eg.Node,
+        merged: Optional[Dict[int, Tuple[Knowledge, Knowledge]]] = None,
+    ):
+        """
+        adds the buffered knowledge of a module at once. the subtrees of recursively added knowledge are flattened
+        iteratively, the duality edges are drawn in one pass and every dependency is notified once.
+        knowledge, that does not fit into the graph, is logged and skipped, so the rest of the module's knowledge is
+        still added.
+
+        :param add_knowledge_buffer: the (parent, key, knowledge, certainty, recursive) entries of a module manager
+        :param node: the node of the module, that added the knowledge
+        :param merged: the merged knowledge of previous batches of the module, see merge_knowledge
+        """
+        if merged is None:
+            merged = {}
+        added = []
+        updated = []
+        for parent, key, knowledge, certainty, recursive in add_knowledge_buffer:
+            # knowledge can be added to a child of the module, that has been merged into an existing one
+            parent = merged.get(id(parent), (None, parent))[1]
+            try:
+                self.merge_knowledge(parent, key, knowledge, certainty, recursive, merged, added, updated)
+            except (ValueError, TypeError):
+                self._logger.exception(f"cannot add {knowledge!s} as {key} of {parent!s}, skipping it")
+
+        for knowledge, certainty in added:
+            self.draw_duality_edge(knowledge, node, certainty, DualityEdgeType.ADD)
+        self.notify_batch([knowledge for knowledge, certainty in added])
+        for knowledge, certainty in updated:
+            self.draw_duality_edge(knowledge, node, certainty, DualityEdgeType.UPDATE)
+        self.notify_batch([knowledge for knowledge, certainty in updated], True)
+
+    def merge_knowledge(
+        self,
+        parent: Knowledge,
+        key: str,
+        knowledge: Knowledge,
+        certainty: float,
+        recursive: bool,
+        merged: Dict[int, Tuple[Knowledge, Knowledge]],
+        added: List[Tuple[Knowledge, float]],
+        updated: List[Tuple[Knowledge, float]],
+    ):
+        """
+        adds the knowledge, unless the parent already has its SINGLETON child with the key. a second child of the
+        same type is merged into the existing one: its children are added to the existing child instead (e.g. the
+        credentials of a target found by two modules). any other second child replaces the existing one, if that has
+        been added by an earlier merge (e.g. the status of a target, that went down). the parent is updated then. a
+        second child added in the same batch conflicts with the first one and is dropped.
+
+        :param merged: maps the ids of merged knowledge to the knowledge and the child it is merged into
+        :param added: the added knowledge and its certainty
+        :param updated: the updated knowledge and its certainty
+        """
+        if parent is None or key not in parent.lookup or parent.schema.get(key, (None, None))[1] != SINGLETON:
+            # adds the knowledge into the tree thus "building the bridge" for its children
+            self.add_knowledge(parent, key, knowledge)
+            self.append_added(knowledge, certainty, recursive, added)
+            return
+
+        existing = parent.lookup[key][0]
+        if existing is knowledge:
+            return
+        if type(existing) is type(knowledge) and knowledge.schema:
+            merged[id(knowledge)] = (knowledge, existing)
+            for child_parent, child_key, child in kg.child_edges(knowledge):
+                self.merge_knowledge(existing, child_key, child, certainty, recursive, merged, added, updated)
+            return
+        if type(existing) is type(knowledge) and existing == knowledge:
+            return
+
+        if any(existing is other for other, other_certainty in added):
+            self._logger.warning(f"{parent!s} already has the {key} {existing!s}, dropping {knowledge!s}")
+            return
+
+        self._logger.debug(f"replacing the {key} {existing!s} of {parent!s} with {knowledge!s}")
+        self.knowledge_graph.replace_knowledge(parent, key, knowledge)
+        self.append_added(knowledge, certainty, recursive, added)
+        updated.append((parent, certainty))
+
+    @staticmethod
+    def append_added(knowledge: Knowledge, certainty: float, recursive: bool, added: List[Tuple[Knowledge, float]]):
+        """
+        appends the knowledge and, if it is added recursively, its subtree to the added knowledge of a batch
+        """
+        added.append((knowledge, certainty))
+        if recursive:
+            # all knowledge of the subtree counts as added by the module
+            queue = deque(kg.children(knowledge))
+            while queue:
+                child = queue.popleft()
+                added.append((child, certainty))
+                queue.extend(kg.children(child))
+
+    def notify_batch(self, knowledge_list: List[Knowledge], only_update=False):
+        """
+        notifies the observers about many knowledge at once. every dependency gets a single KnowledgeBatchEvent with
+        the knowledge, that its preconditions accept, and the keys of the preconditions to check for each knowledge.
+        """
+        if not knowledge_list:
+            return
+
+        batches = {}  # type: Dict[Dependency, Tuple[List[Knowledge], List[List[str]]]]
+        for knowledge in knowledge_list:
+            for dependency, keys in self.dispatch(type(knowledge)).items():
+                if dependency in batches:
+                    batches[dependency][0].append(knowledge)
+                    batches[dependency][1].append(keys)
+                else:
+                    batches[dependency] = ([knowledge], [keys])
+        for dependency, (dependency_knowledge, keys) in batches.items():
+            self.send(dependency, KnowledgeBatchEvent(dependency_knowledge, only_update, keys))
+
+        event = KnowledgeBatchEvent(knowledge_list, only_update)
+        for observer in self.observers:
+            if not isinstance(observer, Dependency):
+                self.send(observer, event)
 
     def notify(self, knowledge: Knowledge, only_update=False):
-        e = Event()
-        e.knowledge = knowledge
-        e.only_update = only_update
-        self.notify_all(e)
+        self.notify_batch([knowledge], only_update)
 
     @staticmethod
     def filter_string(raw_string):
@@ -1,10 +1,49 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, List, Optional, Iterable, Tuple
 
 
 class Event:
     pass
 
 
+class KnowledgeBatchEvent(Event):
+    """
+    an event, that carries many knowledge at once. observers process it in one pass instead of one event per
+    knowledge.
+    """
+
+    def __init__(self, knowledge: List[Any], only_update: bool = False, keys: Optional[List[Any]] = None):
+        """
+        :param knowledge: the new (or updated) knowledge
+        :param only_update: True, if the knowledge is only updated
+        :param keys: optional for every knowledge, which parts of the observer are concerned by it (e.g. the keys of
+                     the preconditions of a Dependency), None for all
+        """
+        super(KnowledgeBatchEvent, self).__init__()
+        self.knowledge = knowledge
+        self.only_update = only_update
+        self.keys = keys
+
+    def items(self) -> Iterable[Tuple[Any, Any]]:
+        """
+        :return: pairs of knowledge and their keys
+        """
+        if self.keys is None:
+            return ((knowledge, None) for knowledge in self.knowledge)
+        return zip(self.knowledge, self.keys)
+
+    def merge(self, other: "KnowledgeBatchEvent"):
+        """
+        appends the knowledge of the other event to the lists of this event
+        """
+        if self.keys is not None or other.keys is not None:
+            if self.keys is None:
+                self.keys = [None] * len(self.knowledge)
+            self.keys.extend(keys for knowledge, keys in other.items())
+        self.knowledge.extend(other.knowledge)
+
+
 class Observer(ABC):
     def __init__(self, **kwargs):
         super(Observer, self).__init__(**kwargs)
@@ -18,6 +57,8 @@ class Observable(ABC):
     def __init__(self, **kwargs):
         super(Observable, self).__init__(**kwargs)
         self.observers = []
+        # the (observer, event) pairs, that are held back in deferred mode, None if events are sent immediately
+        self.deferred_events = None  # type: Optional[List[Tuple[Observer, Event]]]
 
     def register(self, observer: Observer):
         if observer not in self.observers:
@@ -27,6 +68,68 @@ class Observable(ABC):
         if observer in self.observers:
             self.observers.remove(observer)
 
+    def send(self, observer: Observer, event: Event):
+        """
+        sends the event to the observer, in deferred mode the event is held back until the mode ends
+        """
+        if self.deferred_events is None:
+            observer.notify(self, event)
+        else:
+            self.deferred_events.append((observer, event))
+
     def notify_all(self, event: Event):
         for observer in self.observers:
-            observer.notify(self, event)
+            self.send(observer, event)
+
+    @contextmanager
+    def hold_events(self):
+        """
+        holds back all events sent in the context, they can be sent later by send_events.
+
+        :return: the list, that collects the (observer, event) pairs
+        """
+        outer_events, self.deferred_events = self.deferred_events, []
+        try:
+            yield self.deferred_events
+        finally:
+            self.deferred_events = outer_events
+
+    def send_events(self, events: List[Tuple[Observer, Event]]):
+        """
+        sends held back events coalesced, see coalesce
+        """
+        for observer, event in coalesce(events):
+            self.send(observer, event)
+
+    @contextmanager
+    def deferred(self):
+        """
+        holds back all events sent in the context and sends them coalesced at its end.
+        """
+        with self.hold_events() as events:
+            yield
+        self.send_events(events)
+
+
+def coalesce(events: List[Tuple[Observer, Event]]) -> List[Tuple[Observer, Event]]:
+    """
+    merges the KnowledgeBatchEvents for the same observer and only_update flag into the first of them, other events
+    are kept as they are.
+
+    :param events: the (observer, event) pairs in the order they were sent
+    :return: the coalesced pairs
+    """
+    coalesced = []
+    batches = {}
+    for observer, event in events:
+        if isinstance(event, KnowledgeBatchEvent):
+            batch_key = (id(observer), event.only_update)
+            if batch_key in batches:
+                batches[batch_key].merge(event)
+                continue
+            # copy, the event can be sent to other observers, too
+            keys = None if event.keys is None else list(event.keys)
+            event = KnowledgeBatchEvent(list(event.knowledge), event.only_update, keys)
+            batches[batch_key] = event
+        coalesced.append((observer, event))
+    return coalesced
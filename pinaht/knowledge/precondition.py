@@ -1,12 +1,22 @@
 from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Set, Tuple
 from pinaht.knowledge.types.knowledge import Knowledge
 
 
 class Precondition(ABC):
     """
     A precondition Interface
+
+    accepted_types are the types of knowledge, for which holds can be > 0.0. None means any knowledge. Observables
+    like the Manager use them to call only the preconditions, that can accept a new knowledge.
+
+    cached preconditions only depend on the knowledge itself, not on its children or other state. their certainties
+    are memoized by precondition_cache until the knowledge is updated.
     """
 
+    accepted_types: Optional[Tuple[type, ...]] = None
+    cached = False
+
     def __init__(self, **kwargs):
         super(Precondition, self).__init__(**kwargs)
 
@@ -20,6 +30,26 @@ class Precondition(ABC):
         """
         raise NotImplementedError()
 
+    def holds_batch(self, knowledge_list: List[Knowledge]) -> List[float]:
+        """
+        checks the precondition for many knowledge at once, preconditions can override it with a vectorised check.
+
+        :param knowledge_list: the knowledge to check
+        :return: the degree of certainty for each knowledge
+        """
+        return [self.certainty(knowledge) for knowledge in knowledge_list]
+
+    def certainty(self, knowledge: Knowledge) -> float:
+        """
+        the certainty of holds, which is looked up in precondition_cache for cached preconditions.
+
+        :param knowledge: the knowledge to check
+        :return: float, degree of certainty
+        """
+        if self.cached:
+            return precondition_cache.certainty(self, knowledge)
+        return self.holds(knowledge)
+
     @abstractmethod
     def doc(self, knowledge: Knowledge) -> str:
         """
@@ -33,6 +63,42 @@ class Precondition(ABC):
         return self.__class__.__name__
 
 
+class PreconditionCache:
+    """
+    memoizes the certainties of cached preconditions per knowledge. the entries are read and written without a lock,
+    a race between threads only computes a certainty twice. the entries keep their knowledge alive, every Application
+    clears the cache when it starts.
+    """
+
+    def __init__(self):
+        # maps id(knowledge) to the knowledge and the certainties of the preconditions for it, the knowledge is kept
+        # to detect a reused id
+        self.entries: Dict[int, Tuple[Knowledge, Dict[Precondition, float]]] = {}
+
+    def certainty(self, precondition: Precondition, knowledge: Knowledge) -> float:
+        entry = self.entries.get(id(knowledge))
+        if entry is None or entry[0] is not knowledge:
+            entry = (knowledge, {})
+            self.entries[id(knowledge)] = entry
+
+        certainties = entry[1]
+        if precondition not in certainties:
+            certainties[precondition] = precondition.holds(knowledge)
+        return certainties[precondition]
+
+    def invalidate(self, knowledge: Knowledge):
+        """
+        removes the certainties of the knowledge, e.g. if it has been updated
+        """
+        self.entries.pop(id(knowledge), None)
+
+    def clear(self):
+        self.entries.clear()
+
+
+precondition_cache = PreconditionCache()
+
+
 class MetaPrecondition(ABC):
     """ """
 
@@ -47,6 +113,26 @@ class MetaPrecondition(ABC):
 
         raise NotImplementedError()
 
+    def structure(self) -> List[Tuple[str, Set[str], int]]:
+        """
+        structure describes the parent-child relations between the keys, that are necessary for holds to be > 0.0.
+        They allow to join the knowledge along the knowledge graph, instead of checking every grouping.
+
+        :return: a list of (parent key, children keys, max depth) triples, every children knowledge must be the
+                 parent knowledge or one of its descendants up to max depth.
+        """
+        return []
+
+    def monotonic(self) -> bool:
+        """
+        monotonic metapreconditions do not change their certainty for a grouping once it has been evaluated, like
+        the structural ones. Dependency resolves only their new groupings.
+
+        :return: True, if the certainty of holds does not change for a grouping, False if it depends on knowledge
+                 outside the grouping, e.g. on the children of a knowledge
+        """
+        return True
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -1,7 +1,6 @@
 from typing import Iterable, Callable, List
 from pinaht.knowledge.types.knowledge import Knowledge
 from pinaht.knowledge.precondition import MetaPrecondition
-import numpy as np
 
 
 def id_aggregation_function(knowledge: Iterable[Knowledge]) -> float:
@@ -65,37 +64,23 @@ def identical_ancestors(precondition_keys: Iterable[str]):
             super(CheckMetaPrecondition, self).__init__(**kwargs)
 
         def holds(self, **kwargs) -> float:
-            knowledge = list(map(lambda key: kwargs[key], precondition_keys))
-
-            minimum = np.inf
-            maximum = 0
-            for i in range(len(knowledge)):
-                current_knowledge = knowledge[i]
-                knowledge_list = [current_knowledge]
-                while current_knowledge.parent is not None:
-                    current_knowledge = current_knowledge.parent
-                    knowledge_list.append(current_knowledge)
-                knowledge[i] = list(map(lambda x: id(x), knowledge_list))
-                knowledge[i].reverse()
-                minimum = min(minimum, len(knowledge[i]))
-                maximum = max(maximum, len(knowledge[i]))
-
-            matrix = np.zeros((len(knowledge), maximum)) + np.inf
-            for i in range(len(knowledge)):
-                for j in range(len(knowledge[i])):
-                    matrix[i, j] = knowledge[i][j]
-
-            matrix = np.transpose(matrix)
-            n, d = matrix.shape
-            depth = 0
-            for i in range(n):
-                if all(matrix[i, :] == np.array([matrix[i, 0]] * d)):
-                    depth = i
+            paths = [kwargs[key].ancestor_ids() for key in precondition_keys]
+            minimum = min(len(path) for path in paths)
+            maximum = max(len(path) for path in paths)
+
+            # the index of the deepest common ancestor in the paths. the ancestors of a common ancestor are common
+            # as well, thus it can be found by a binary search, 0 if there is no common ancestor
+            low, high = 0, minimum - 1
+            while low < high:
+                middle = (low + high + 1) // 2
+                if all(path[middle] == paths[0][middle] for path in paths):
+                    low = middle
                 else:
-                    break
+                    high = middle - 1
+            depth = low
 
             temp = (minimum - depth - 1) + (maximum - depth - 1)
-            temp /= 2 * (n - 1)
+            temp /= 2 * (maximum - 1)
             temp = 1.0 - temp
 
             return temp
@@ -113,6 +98,15 @@ def merge(metapreconditions: List[MetaPrecondition], f: Callable[[Iterable[float
         def holds(self, **kwargs):
             return f(map(lambda meta: meta.holds(**kwargs), metapreconditions))
 
+        def structure(self):
+            # with min every metaprecondition must hold, thus its structure must hold as well
+            if f is min:
+                return [constraint for meta in metapreconditions for constraint in meta.structure()]
+            return []
+
+        def monotonic(self):
+            return all(meta.monotonic() for meta in metapreconditions)
+
     return MergeMetaPrecondition()
 
 
@@ -124,6 +118,10 @@ def invert(metaprecondition: MetaPrecondition) -> MetaPrecondition:
         def holds(self, **kwargs):
             return 1 - metaprecondition.holds(**kwargs)
 
+        def monotonic(self):
+            # a grouping, that does not hold yet, may hold later on
+            return False
+
     return InverseMetaPrecondition()
 
 
@@ -149,6 +147,9 @@ def is_parent(parent_key: str, children_keys: Iterable[str], max_depth=1) -> Met
 
             return 1.0
 
+        def structure(self):
+            return [(parent_key, children_keys, max_depth)]
+
     return ParentMetaPrecondition()
 
 
@@ -160,8 +161,12 @@ def check_empty_child(parent_key: str, children_key: str) -> MetaPrecondition:
         def holds(self, **kwargs) -> float:
             knowledge = kwargs[parent_key]
 
-            if children_key in knowledge.lookup:
-                return 0.0 if len(knowledge.lookup[children_key]) > 0 else 1.0
+            if children_key in knowledge.schema:
+                return 0.0 if len(knowledge.lookup.get(children_key, [])) > 0 else 1.0
             return 0.0
 
+        def monotonic(self):
+            # the child may be added later on
+            return False
+
     return CheckPrecondition()
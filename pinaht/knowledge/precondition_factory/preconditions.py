@@ -6,6 +6,8 @@ from pinaht.knowledge.precondition import Precondition
 
 def check_type(target_type: type) -> Precondition:
     class CheckPrecondition(Precondition):
+        accepted_types = (target_type,)
+
         def __init__(self, **kwargs):
             super(CheckPrecondition, self).__init__(**kwargs)
 
@@ -22,6 +24,9 @@ def check_type(target_type: type) -> Precondition:
 
 def check_value(value: Knowledge) -> Precondition:
     class CheckPrecondition(Precondition):
+        # fuzzy_eq of knowledge of another type is 0.0
+        accepted_types = (type(value),)
+
         def __init__(self, **kwargs):
             super(CheckPrecondition, self).__init__(**kwargs)
 
@@ -35,11 +40,18 @@ def check_value(value: Knowledge) -> Precondition:
 
 
 def compare_value(
-    f: Callable[[Knowledge], float], description: Callable[[Knowledge], str] = lambda x: "no information"
+    f: Callable[[Knowledge], float],
+    description: Callable[[Knowledge], str] = lambda x: "no information",
+    cached: bool = False,
 ) -> Precondition:
+    """
+    :param cached: True, if f only depends on the knowledge itself, see Precondition
+    """
+
     class ContainsPrecondition(Precondition):
         def __init__(self, **kwargs):
             super(ContainsPrecondition, self).__init__(**kwargs)
+            self.cached = cached
 
         def holds(self, knowledge: Knowledge) -> float:
             return f(knowledge)
@@ -54,6 +66,9 @@ def check_str(
     f: Callable[[str], float], description: Callable[[str], str] = lambda x: "no information"
 ) -> Precondition:
     class ContainsPrecondition(Precondition):
+        accepted_types = (str,)
+        cached = True
+
         def __init__(self, **kwargs):
             super(ContainsPrecondition, self).__init__(**kwargs)
 
@@ -72,6 +87,9 @@ def check_version(
     compare: Callable[[Version], float], description: Callable[[Version], str] = lambda x: "no information"
 ) -> Precondition:
     class CheckPrecondition(Precondition):
+        accepted_types = (Version,)
+        cached = True
+
         def __init__(self, **kwargs):
             super(CheckPrecondition, self).__init__(**kwargs)
 
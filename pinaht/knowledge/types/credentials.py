@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.password import Password
@@ -17,6 +20,12 @@ class Credentials(Knowledge):
     Holds unmatched usernames and passwords.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"passwords": (Password, LIST), "users": (Name, LIST)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Credentials.
@@ -25,13 +34,6 @@ class Credentials(Knowledge):
         super().__init__()
         self.init_credentials(*args)
 
-        self.passwords = []
-
-        self.users = []
-
-        self.type = "BRANCH"
-        self.lookup = {"passwords": self.passwords, "users": self.users}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,6 +41,14 @@ class Credentials(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def passwords(self) -> List[Password]:
+        return self.lookup.get("passwords", [])
+
+    @property
+    def users(self) -> List[Name]:
+        return self.lookup.get("users", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -50,24 +60,6 @@ class Credentials(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Credentials' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "passwords" and isinstance(child, Password):
-            self.passwords.append(child)
-            child.parent = self
-
-        elif key == "users" and isinstance(child, Name):
-            self.users.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_credentials(self, *args):  # noqa F811
         pass
 
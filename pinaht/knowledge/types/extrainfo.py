@@ -12,6 +12,10 @@ class ExtraInfo(Knowledge):
     Extra Information.
     """
 
+    __slots__ = ()
+
+    type = "ABSTRACT"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class ExtraInfo.
@@ -20,9 +24,6 @@ class ExtraInfo(Knowledge):
         super().__init__()
         self.init_extrainfo(*args)
 
-        self.type = "ABSTRACT"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -38,16 +39,6 @@ class ExtraInfo(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'ExtraInfo' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_extrainfo(self, *args):  # noqa F811
         pass
 
@@ -15,6 +15,10 @@ class FsTree(Knowledge):
     Tree structure mirroring the target's filesystem
     """
 
+    __slots__ = ()
+
+    type = "ABSTRACT"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class FsTree.
@@ -23,9 +27,6 @@ class FsTree(Knowledge):
         super().__init__()
         self.init_fstree(*args)
 
-        self.type = "ABSTRACT"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -41,16 +42,6 @@ class FsTree(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'FsTree' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_fstree(self, *args):  # noqa F811
         pass
 
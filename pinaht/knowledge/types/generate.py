@@ -6,6 +6,12 @@ from graphviz import Source
 
 USER_METHOD_SEPERATOR = "### USER DEFINED METHODS ###"
 
+# the instance attributes of Knowledge, see knowledge.py
+KNOWLEDGE_SLOTS = ["_parent", "_ancestors", "duality_edges", "lookup"]
+
+# builtin types, that allow non-empty __slots__ in a subclass
+SLOTS_BUILTINS = ["str"]
+
 
 def check_model_consistency(model):
     if model is None:
@@ -48,6 +54,9 @@ def check_model_consistency(model):
         if model["visualization"][key] == "":
             raise ValueError("Visualization style configuration attribute '" + key + "' can't be empty")
 
+    if "slots" in model["config"] and not isinstance(model["config"]["slots"], bool):
+        raise ValueError("General configuration attribute 'slots' has to be a boolean.")
+
     recognized_types = []
     recognized_types_kind = {}
     for classtype in model["types"]:
@@ -57,6 +66,8 @@ def check_model_consistency(model):
             raise ValueError("Missing 'kind' attribute in type '" + classtype["name"] + "'.")
         if "description" not in classtype:
             raise ValueError("Missing description in type '" + classtype["name"] + "'.")
+        if "slots" in classtype and not isinstance(classtype["slots"], bool):
+            raise ValueError("'slots' attribute in type '" + classtype["name"] + "' has to be a boolean.")
         recognized_types.append(classtype["name"])
         recognized_types_kind[classtype["name"]] = classtype["kind"]
 
@@ -292,9 +303,30 @@ def preprocess_class_info(info_obj):
     return obj
 
 
+def get_slots(info_obj, classtype):
+    """
+    returns the __slots__ of the generated class. types with an own state (LEAF_CUSTOM, types with 'slots: false'),
+    enums and subclasses of variable sized builtins like int keep their __dict__.
+
+    :param info_obj: the model
+    :param classtype: the type
+    :return: a list of slot names or None, if the class has no __slots__
+    """
+
+    if not info_obj["config"].get("slots", False) or not classtype.get("slots", True):
+        return None
+    if classtype["kind"] == "ABSTRACT":
+        # the subclasses declare the slots, otherwise they conflict with the layout of builtins
+        return []
+    if classtype["kind"] == "BRANCH" or (classtype["kind"] == "LEAF_EXTENDS" and classtype["is"] in SLOTS_BUILTINS):
+        return KNOWLEDGE_SLOTS
+    return None
+
+
 def preprocess_type_info(info_obj):
     lst = []
     for t in info_obj["types"]:
+        t["slots"] = get_slots(info_obj, t)
         if "fuzzy_eq" in t and not t["fuzzy_eq"] == "":
             t["fuzzy_eq"] = (" " * 8) + t["fuzzy_eq"].replace("\n", "\n" + (" " * 8))
         if "description" not in t or t["description"] == "":
@@ -15,6 +15,8 @@ class HeartbleedVulnerable(ExtraInfo, bool):
     Indicates if the service is vulnerable for the heartbleed attack.
     """
 
+    type = "LEAF_EXTENDS"
+
     def __new__(cls, *args, **kwargs):
         return super(HeartbleedVulnerable, cls).__new__(cls, args[0])
 
@@ -26,9 +28,6 @@ class HeartbleedVulnerable(ExtraInfo, bool):
         super().__init__()
         self.init_heartbleedvulnerable(*args)
 
-        self.type = "LEAF_EXTENDS"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -42,16 +41,6 @@ class HeartbleedVulnerable(ExtraInfo, bool):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'HeartbleedVulnerable' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_heartbleedvulnerable(self, *args):  # noqa F811
         pass
 
@@ -15,6 +15,10 @@ class Info(ExtraInfo, str):
     Additional infos about the service.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "LEAF_EXTENDS"
+
     def __new__(cls, *args, **kwargs):
         return super(Info, cls).__new__(cls, args[0])
 
@@ -26,9 +30,6 @@ class Info(ExtraInfo, str):
         super().__init__()
         self.init_info(*args)
 
-        self.type = "LEAF_EXTENDS"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -42,16 +43,6 @@ class Info(ExtraInfo, str):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Info' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_info(self, *args):  # noqa F811
         pass
 
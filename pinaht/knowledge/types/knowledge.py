@@ -1,10 +1,27 @@
 from abc import ABC, abstractmethod, ABCMeta
 from enum import EnumMeta
+from itertools import count
+from types import MappingProxyType
+from typing import Optional, Tuple
 import logging
 
+# shared by all knowledge without children, replaced by a dict when the first child is added
+EMPTY_LOOKUP = MappingProxyType({})
+
+# the cardinalities of children in the schema of a type
+SINGLETON = "SINGLETON"
+LIST = "LIST"
+
+# numbers the changes of the tree structure, that invalidate the cached ancestor paths
+_generations = count(1)
+
 
 class KnowledgeEnumMeta(ABCMeta, EnumMeta):
-    pass
+    def __new__(metacls, *args, **kwargs):
+        enum_class = super().__new__(metacls, *args, **kwargs)
+        # can't be defined in the class body, it would become a member of the enum
+        enum_class.type = "LEAF_ENUM"
+        return enum_class
 
 
 class Knowledge(ABC):
@@ -12,24 +29,126 @@ class Knowledge(ABC):
     The Knowledge interface. It structures the behavior of knowledge.
     """
 
+    # generated types declare the instance attributes as slots, if the base type allows it
+    __slots__ = ()
+
+    type = ""
+    # the generation of the tree structure, a cached ancestor path of an older generation is invalid
+    generation = 0
+    # maps the key of the children to their type and cardinality, generated from types.yaml
+    schema = MappingProxyType({})
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._logger = logging.getLogger(cls.__name__)
+
     def __init__(self, *args, **kwargs):
         super(Knowledge, self).__init__()
 
-        self.color = "w"
-        self.parent = None
-        self.type = ""
+        self._parent = None
+        # (generation, ids of the ancestors), see ancestor_ids
+        self._ancestors = None
         self.duality_edges = []
-        self.lookup = {}
-        self._logger = logging.getLogger(self.__class__.__name__)
+        self.lookup = EMPTY_LOOKUP
+
+    @property
+    def parent(self) -> Optional["Knowledge"]:
+        return self._parent
+
+    @parent.setter
+    def parent(self, parent: Optional["Knowledge"]):
+        if parent is self._parent:
+            return
+        if self.lookup is not EMPTY_LOOKUP:
+            # the ancestors of the descendants change. a leaf (e.g. an enum member shared by many targets) only
+            # resets its own path below
+            Knowledge.generation = next(_generations)
+        self._parent = parent
+        self._ancestors = None
+
+    def ancestor_ids(self) -> Tuple[int, ...]:
+        """
+        the path of ids from the root down to the knowledge. it is cached, until the parent of the knowledge or of
+        one of its ancestors is replaced.
+
+        :return: a tuple of ids, the last one is the id of the knowledge
+        """
+        ancestors = self._ancestors
+        if ancestors is not None and ancestors[0] == Knowledge.generation:
+            return ancestors[1]
+
+        generation = Knowledge.generation
+        if self._parent is None:
+            path = (id(self),)
+        else:
+            path = self._parent.ancestor_ids() + (id(self),)
+        self._ancestors = (generation, path)
+        return path
 
     @abstractmethod
     def fuzzy_eq(self, other) -> float:
         """ """
         raise NotImplementedError()
 
-    @abstractmethod
     def add_child(self, key, child):
-        raise NotImplementedError()
+        """
+        adds the child with the given key after checking it with the schema of the type.
+
+        :param key: the key of the child
+        :param child: the child
+        """
+
+        entry = self.schema.get(key)
+        if entry is None:
+            raise ValueError(
+                f"Type '{self.__class__.__name__}' has no child/attribute with name {key}. "
+                "Check types.yaml or the generated PDF for correct identifiers."
+            )
+        child_type, cardinality = entry
+        if not isinstance(child, child_type):
+            raise TypeError(f"Child for attribute {key} is not of the right type")
+        if cardinality == SINGLETON and key in self.lookup:
+            raise ValueError(f"Type '{self.__class__.__name__}' can only have one child with name {key}.")
+        self.append_child(key, child)
+
+    def replace_child(self, key, child) -> "Knowledge":
+        """
+        replaces the SINGLETON child with the given key, e.g. if its value has changed.
+
+        :param key: the key of the child
+        :param child: the new child
+        :return: the replaced child
+        """
+
+        entry = self.schema.get(key)
+        if entry is None or entry[1] != SINGLETON or key not in self.lookup:
+            raise ValueError(f"Type '{self.__class__.__name__}' has no SINGLETON child with name {key} to replace.")
+        if not isinstance(child, entry[0]):
+            raise TypeError(f"Child for attribute {key} is not of the right type")
+
+        replaced = self.lookup[key][0]
+        self.lookup[key][0] = child
+        # enum knowledge is shared, it can have another parent by now
+        if replaced.parent is self:
+            replaced.parent = None
+        child.parent = self
+        return replaced
+
+    def append_child(self, key, child):
+        """
+        appends the child to the children with the given key, the lists are allocated on the first child.
+
+        :param key: the key of the children
+        :param child: the child
+        """
+
+        if self.lookup is EMPTY_LOOKUP:
+            self.lookup = {key: [child]}
+        elif key in self.lookup:
+            self.lookup[key].append(child)
+        else:
+            self.lookup[key] = [child]
+        child.parent = self
 
     def add_duality_edge(self, edge):
         self.duality_edges.append(edge)
@@ -15,6 +15,8 @@ class LocalFsTree(FsTree):
     Tree structure mirroring a local filesystem
     """
 
+    type = "LEAF_CUSTOM"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class LocalFsTree.
@@ -23,9 +25,6 @@ class LocalFsTree(FsTree):
         super().__init__()
         self.init_localfstree(*args)
 
-        self.type = "LEAF_CUSTOM"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -41,16 +40,6 @@ class LocalFsTree(FsTree):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'LocalFsTree' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_localfstree(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.ipaddress import IPAddress
@@ -18,6 +21,12 @@ class LocalHost(Knowledge):
     A LocalHost describes knowledge about the computer the program is running on.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"address": (IPAddress, LIST), "executable": (Executable, LIST)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class LocalHost.
@@ -26,13 +35,6 @@ class LocalHost(Knowledge):
         super().__init__()
         self.init_localhost(*args)
 
-        self.address = []
-
-        self.executable = []
-
-        self.type = "BRANCH"
-        self.lookup = {"address": self.address, "executable": self.executable}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -40,6 +42,14 @@ class LocalHost(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def address(self) -> List[IPAddress]:
+        return self.lookup.get("address", [])
+
+    @property
+    def executable(self) -> List[Executable]:
+        return self.lookup.get("executable", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -51,24 +61,6 @@ class LocalHost(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'LocalHost' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "address" and isinstance(child, IPAddress):
-            self.address.append(child)
-            child.parent = self
-
-        elif key == "executable" and isinstance(child, Executable):
-            self.executable.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_localhost(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.name import Name
@@ -17,6 +20,12 @@ class LoginUser(Knowledge):
     Describes an Object of the Type User.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"name": (Name, SINGLETON), "password": (Password, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class LoginUser.
@@ -25,13 +34,6 @@ class LoginUser(Knowledge):
         super().__init__()
         self.init_loginuser(*args)
 
-        self.name = []
-
-        self.password = []
-
-        self.type = "BRANCH"
-        self.lookup = {"name": self.name, "password": self.password}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,6 +41,14 @@ class LoginUser(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def name(self) -> List[Name]:
+        return self.lookup.get("name", [])
+
+    @property
+    def password(self) -> List[Password]:
+        return self.lookup.get("password", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -50,24 +60,6 @@ class LoginUser(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'LoginUser' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "name" and isinstance(child, Name):
-            self.name.append(child)
-            child.parent = self
-
-        elif key == "password" and isinstance(child, Password):
-            self.password.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_loginuser(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.shell import Shell
@@ -19,6 +22,10 @@ class MetasploitShell(Shell):
     Wraps shells created by Metasploit.
     """
 
+    type = "BRANCH"
+
+    schema = {"privilege": (Privilege, SINGLETON), "shelluser": (User, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class MetasploitShell.
@@ -27,13 +34,6 @@ class MetasploitShell(Shell):
         super().__init__()
         self.init_metasploitshell(*args)
 
-        self.privilege = []
-
-        self.shelluser = []
-
-        self.type = "BRANCH"
-        self.lookup = {"privilege": self.privilege, "shelluser": self.shelluser}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -41,6 +41,14 @@ class MetasploitShell(Shell):
             else:
                 self.add_child(key, item)
 
+    @property
+    def privilege(self) -> List[Privilege]:
+        return self.lookup.get("privilege", [])
+
+    @property
+    def shelluser(self) -> List[User]:
+        return self.lookup.get("shelluser", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -52,24 +60,6 @@ class MetasploitShell(Shell):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'MetasploitShell' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "privilege" and isinstance(child, Privilege):
-            self.privilege.append(child)
-            child.parent = self
-
-        elif key == "shelluser" and isinstance(child, User):
-            self.shelluser.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_metasploitshell(self, *args):  # noqa F811
         pass
 
@@ -12,6 +12,10 @@ class Name(Knowledge, str):
     Describes an Object of the Type Name.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "LEAF_EXTENDS"
+
     def __new__(cls, *args, **kwargs):
         return super(Name, cls).__new__(cls, args[0])
 
@@ -23,9 +27,6 @@ class Name(Knowledge, str):
         super().__init__()
         self.init_name(*args)
 
-        self.type = "LEAF_EXTENDS"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,16 +40,6 @@ class Name(Knowledge, str):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Name' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_name(self, *args):  # noqa F811
         pass
 
@@ -12,6 +12,8 @@ class NetMask(Knowledge, int):
     The number of 1 in the net mask for the network.
     """
 
+    type = "LEAF_EXTENDS"
+
     def __new__(cls, *args, **kwargs):
         return super(NetMask, cls).__new__(cls, args[0])
 
@@ -23,9 +25,6 @@ class NetMask(Knowledge, int):
         super().__init__()
         self.init_netmask(*args)
 
-        self.type = "LEAF_EXTENDS"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,16 +38,6 @@ class NetMask(Knowledge, int):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'NetMask' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_netmask(self, *args):  # noqa F811
         pass
 
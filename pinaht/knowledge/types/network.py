@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.target import Target
@@ -21,6 +24,17 @@ class Network(Knowledge):
     Describes an Object of the Type Network. A network contains several targets to attack.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {
+        "targets": (Target, LIST),
+        "local_host": (LocalHost, SINGLETON),
+        "net_mask": (NetMask, SINGLETON),
+        "address": (IPAddress, SINGLETON),
+    }
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Network.
@@ -29,22 +43,6 @@ class Network(Knowledge):
         super().__init__()
         self.init_network(*args)
 
-        self.targets = []
-
-        self.local_host = []
-
-        self.net_mask = []
-
-        self.address = []
-
-        self.type = "BRANCH"
-        self.lookup = {
-            "targets": self.targets,
-            "local_host": self.local_host,
-            "net_mask": self.net_mask,
-            "address": self.address,
-        }
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -52,6 +50,22 @@ class Network(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def targets(self) -> List[Target]:
+        return self.lookup.get("targets", [])
+
+    @property
+    def local_host(self) -> List[LocalHost]:
+        return self.lookup.get("local_host", [])
+
+    @property
+    def net_mask(self) -> List[NetMask]:
+        return self.lookup.get("net_mask", [])
+
+    @property
+    def address(self) -> List[IPAddress]:
+        return self.lookup.get("address", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -63,32 +77,6 @@ class Network(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Network' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "targets" and isinstance(child, Target):
-            self.targets.append(child)
-            child.parent = self
-
-        elif key == "local_host" and isinstance(child, LocalHost):
-            self.local_host.append(child)
-            child.parent = self
-
-        elif key == "net_mask" and isinstance(child, NetMask):
-            self.net_mask.append(child)
-            child.parent = self
-
-        elif key == "address" and isinstance(child, IPAddress):
-            self.address.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_network(self, *args):  # noqa F811
         pass
 
@@ -30,9 +30,6 @@ class OperatingSystemType(Knowledge, Enum, metaclass=KnowledgeEnumMeta):
         super().__init__()
         self.init_operatingsystemtype(*args)
 
-        self.type = "LEAF_ENUM"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -49,16 +46,6 @@ class OperatingSystemType(Knowledge, Enum, metaclass=KnowledgeEnumMeta):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'OperatingSystemType' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_operatingsystemtype(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.operatingsystemtype import OperatingSystemType
@@ -17,6 +20,12 @@ class OS(Knowledge):
     Describes an Object of the Type OS.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"os_type": (OperatingSystemType, SINGLETON), "expected_version": (Version, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class OS.
@@ -25,13 +34,6 @@ class OS(Knowledge):
         super().__init__()
         self.init_os(*args)
 
-        self.os_type = []
-
-        self.expected_version = []
-
-        self.type = "BRANCH"
-        self.lookup = {"os_type": self.os_type, "expected_version": self.expected_version}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,6 +41,14 @@ class OS(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def os_type(self) -> List[OperatingSystemType]:
+        return self.lookup.get("os_type", [])
+
+    @property
+    def expected_version(self) -> List[Version]:
+        return self.lookup.get("expected_version", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -50,24 +60,6 @@ class OS(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'OS' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "os_type" and isinstance(child, OperatingSystemType):
-            self.os_type.append(child)
-            child.parent = self
-
-        elif key == "expected_version" and isinstance(child, Version):
-            self.expected_version.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_os(self, *args):  # noqa F811
         pass
 
@@ -12,6 +12,8 @@ class Port(Knowledge, int):
     Describes an Object of the Type Port.
     """
 
+    type = "LEAF_EXTENDS"
+
     def __new__(cls, *args, **kwargs):
         return super(Port, cls).__new__(cls, args[0])
 
@@ -23,9 +25,6 @@ class Port(Knowledge, int):
         super().__init__()
         self.init_port(*args)
 
-        self.type = "LEAF_EXTENDS"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,16 +38,6 @@ class Port(Knowledge, int):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Port' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_port(self, *args):  # noqa F811
         pass
 
@@ -28,9 +28,6 @@ class Privilege(Knowledge, Enum, metaclass=KnowledgeEnumMeta):
         super().__init__()
         self.init_privilege(*args)
 
-        self.type = "LEAF_ENUM"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -47,16 +44,6 @@ class Privilege(Knowledge, Enum, metaclass=KnowledgeEnumMeta):
                 return 1.0
         return 0.0
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Privilege' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_privilege(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.shell import Shell
@@ -22,12 +25,22 @@ import random
 
 import string
 
+import codecs
+
+import time
+
+from itertools import count
+
 
 class ProcessShell(Shell):
     """
     Wraps shells in external processes.
     """
 
+    type = "BRANCH"
+
+    schema = {"privilege": (Privilege, SINGLETON), "shelluser": (User, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class ProcessShell.
@@ -36,13 +49,6 @@ class ProcessShell(Shell):
         super().__init__()
         self.init_processshell(*args)
 
-        self.privilege = []
-
-        self.shelluser = []
-
-        self.type = "BRANCH"
-        self.lookup = {"privilege": self.privilege, "shelluser": self.shelluser}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -50,6 +56,14 @@ class ProcessShell(Shell):
             else:
                 self.add_child(key, item)
 
+    @property
+    def privilege(self) -> List[Privilege]:
+        return self.lookup.get("privilege", [])
+
+    @property
+    def shelluser(self) -> List[User]:
+        return self.lookup.get("shelluser", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -61,24 +75,6 @@ class ProcessShell(Shell):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'ProcessShell' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "privilege" and isinstance(child, Privilege):
-            self.privilege.append(child)
-            child.parent = self
-
-        elif key == "shelluser" and isinstance(child, User):
-            self.shelluser.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_processshell(self, *args):  # noqa F811
         pass
 
@@ -87,12 +83,20 @@ class ProcessShell(Shell):
     # Random string that acts as an indicator for a finished shell output
     SEPARATOR = "".join(random.choice(string.ascii_lowercase) for i in range(10))
 
+    # Number of bytes read at once from the process
+    CHUNK_SIZE = 65536
+
+    # Maximum number of bytes of an incomplete output line, that are buffered
+    MAX_BUFFER_SIZE = 1 << 20
+
     def init_processshell(self, *args):  # noqa F811
         """
         Creates a wrapper for a shell in an external process.
 
         :param args[0]: a binary's path and arguments
         """
+        # numbers the separators of the commands
+        self._commands = count()
         try:
             self._shell = pexpect.spawn(args[0], echo=False)
             if not self.check():
@@ -108,30 +112,83 @@ class ProcessShell(Shell):
         :param timeout: number of seconds after which to raise a ShellTimeoutError exception
         :return: shell output
         """
-        self._shell.sendline(f"echo {self.SEPARATOR};{command};echo {self.SEPARATOR}")
-        try:
-            self._shell.expect(self.SEPARATOR, timeout=5)
+        return list(self.execute_stream(command, timeout=timeout, new_shell=new_shell))
 
-            # discard echos if shell is echoing
-            if self._shell.before.decode("utf-8").endswith("echo "):
-                self._shell.expect(self.SEPARATOR, timeout=5)
-                self._shell.expect(self.SEPARATOR, timeout=5)
-        except (pexpect.TIMEOUT):
-            self._logger.error("shell seems to be broken")
-            raise ShellTimeoutError
+    def execute_stream(self, command, timeout=10, new_shell=False, max_buffer_size=None):
+        """
+        Executes a command in the shell and yields its output lines as they arrive. Only the newly read bytes are
+        searched for the end of a line, and only complete lines are compared with the separator. A line longer than
+        max_buffer_size bytes is yielded in parts. If the iteration is stopped early, the next command skips the rest
+        of the output.
+
+        :param command: command to execute
+        :param timeout: number of seconds after which to raise a ShellTimeoutError exception
+        :param new_shell: whether the command starts a new shell
+        :param max_buffer_size: the maximum number of buffered bytes of a line, MAX_BUFFER_SIZE by default
+        :return: iterator over the output lines
+        """
+        if max_buffer_size is None:
+            max_buffer_size = self.MAX_BUFFER_SIZE
+
+        # the outputs of previous commands end with other separators
+        separator = f"{self.SEPARATOR}{next(self._commands)}"
+        # bytes kept of a too long line, that could be the beginning of the separator
+        margin = len("echo " + separator)
+
+        self._shell.sendline(f"echo {separator};{command};echo {separator}")
+        deadline = time.monotonic() + timeout
+        decoder = codecs.getincrementaldecoder("utf-8")("replace")
+
+        # read, but unprocessed output. no end of line is before position searched
+        pending = bytearray(self._shell.buffer)
+        self._shell.buffer = b""
+        searched = 0
+        started = False
 
-        # wait for command execution to finish
         try:
-            if new_shell:
-                self._shell.sendline(f"echo {self.SEPARATOR}")
-            self._shell.expect(self.SEPARATOR, timeout=timeout)
-            output = self._shell.before.decode("utf-8")[2:-2]
-            output_lines = output.splitlines()
-            return output_lines
+            while True:
+                newline = pending.find(b"\n", searched)
+                if newline < 0:
+                    if len(pending) > max_buffer_size + margin:
+                        cut = len(pending) - margin
+                        if started:
+                            yield decoder.decode(bytes(pending[:cut]))
+                        del pending[:cut]
+                    searched = len(pending)
+                    pending += self._shell.read_nonblocking(
+                        self.CHUNK_SIZE, timeout=max(0.0, deadline - time.monotonic())
+                    )
+                    continue
+
+                line = decoder.decode(bytes(pending[:newline])).rstrip("\r")
+                end = newline + 1
+                del pending[:end]
+                searched = 0
+
+                if not started:
+                    # skip everything before the first separator, the echoed command ends with it too
+                    started = line.endswith(separator) and not line.endswith("echo " + separator)
+                    if started and new_shell:  # flush a second echo to recognize the end in the new shell
+                        self._shell.sendline(f"echo {separator}")
+                elif line.endswith(separator):
+                    output = line.rpartition(separator)[0]
+                    if output:
+                        yield output
+                    return
+                else:
+                    yield line
+
         except (pexpect.TIMEOUT):
-            self._logger.error("command timeout expired")
+            if started:
+                self._logger.error("command timeout expired")
+            else:
+                self._logger.error("shell seems to be broken")
             raise ShellTimeoutError
 
+        finally:
+            # the output after the separator is left for the following reads
+            self._shell.buffer = bytes(pending) + self._shell.buffer
+
 
 class ShellSpawnError(Exception):
     """
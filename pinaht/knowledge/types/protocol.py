@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.name import Name
@@ -17,6 +20,12 @@ class Protocol(Knowledge):
     Describes an Object of the Type Protocol.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"name": (Name, SINGLETON), "extended_name": (Name, SINGLETON), "version": (Version, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Protocol.
@@ -25,15 +34,6 @@ class Protocol(Knowledge):
         super().__init__()
         self.init_protocol(*args)
 
-        self.name = []
-
-        self.extended_name = []
-
-        self.version = []
-
-        self.type = "BRANCH"
-        self.lookup = {"name": self.name, "extended_name": self.extended_name, "version": self.version}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -41,6 +41,18 @@ class Protocol(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def name(self) -> List[Name]:
+        return self.lookup.get("name", [])
+
+    @property
+    def extended_name(self) -> List[Name]:
+        return self.lookup.get("extended_name", [])
+
+    @property
+    def version(self) -> List[Version]:
+        return self.lookup.get("version", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -52,28 +64,6 @@ class Protocol(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Protocol' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "name" and isinstance(child, Name):
-            self.name.append(child)
-            child.parent = self
-
-        elif key == "extended_name" and isinstance(child, Name):
-            self.extended_name.append(child)
-            child.parent = self
-
-        elif key == "version" and isinstance(child, Version):
-            self.version.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_protocol(self, *args):  # noqa F811
         pass
 
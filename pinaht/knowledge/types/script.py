@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.extrainfo import ExtraInfo
@@ -21,6 +24,12 @@ class Script(ExtraInfo):
     The result of a nmap script.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"id": (Name, SINGLETON), "output": (Text, SINGLETON), "elements": (ScriptElement, LIST)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Script.
@@ -29,15 +38,6 @@ class Script(ExtraInfo):
         super().__init__()
         self.init_script(*args)
 
-        self.id = []
-
-        self.output = []
-
-        self.elements = []
-
-        self.type = "BRANCH"
-        self.lookup = {"id": self.id, "output": self.output, "elements": self.elements}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -45,6 +45,18 @@ class Script(ExtraInfo):
             else:
                 self.add_child(key, item)
 
+    @property
+    def id(self) -> List[Name]:
+        return self.lookup.get("id", [])
+
+    @property
+    def output(self) -> List[Text]:
+        return self.lookup.get("output", [])
+
+    @property
+    def elements(self) -> List[ScriptElement]:
+        return self.lookup.get("elements", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -56,28 +68,6 @@ class Script(ExtraInfo):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Script' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "id" and isinstance(child, Name):
-            self.id.append(child)
-            child.parent = self
-
-        elif key == "output" and isinstance(child, Text):
-            self.output.append(child)
-            child.parent = self
-
-        elif key == "elements" and isinstance(child, ScriptElement):
-            self.elements.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_script(self, *args):  # noqa F811
         pass
 
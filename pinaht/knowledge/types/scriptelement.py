@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.name import Name
@@ -17,6 +20,12 @@ class ScriptElement(Knowledge):
     A Element of a script result
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {"id": (Name, SINGLETON), "output": (Text, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class ScriptElement.
@@ -25,13 +34,6 @@ class ScriptElement(Knowledge):
         super().__init__()
         self.init_scriptelement(*args)
 
-        self.id = []
-
-        self.output = []
-
-        self.type = "BRANCH"
-        self.lookup = {"id": self.id, "output": self.output}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -39,6 +41,14 @@ class ScriptElement(Knowledge):
             else:
                 self.add_child(key, item)
 
+    @property
+    def id(self) -> List[Name]:
+        return self.lookup.get("id", [])
+
+    @property
+    def output(self) -> List[Text]:
+        return self.lookup.get("output", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -50,24 +60,6 @@ class ScriptElement(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'ScriptElement' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "id" and isinstance(child, Name):
-            self.id.append(child)
-            child.parent = self
-
-        elif key == "output" and isinstance(child, Text):
-            self.output.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_scriptelement(self, *args):  # noqa F811
         pass
 
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.shell import Shell
@@ -26,12 +29,18 @@ import socket
 
 import re
 
+from pinaht.knowledge.types.ssh_pool import ssh_pool
+
 
 class SecureShell(Shell):
     """
     Uses paramiko package to create a shell and execute commands over SSH.
     """
 
+    type = "BRANCH"
+
+    schema = {"privilege": (Privilege, SINGLETON), "shelluser": (User, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class SecureShell.
@@ -40,13 +49,6 @@ class SecureShell(Shell):
         super().__init__()
         self.init_secureshell(*args)
 
-        self.privilege = []
-
-        self.shelluser = []
-
-        self.type = "BRANCH"
-        self.lookup = {"privilege": self.privilege, "shelluser": self.shelluser}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -54,6 +56,14 @@ class SecureShell(Shell):
             else:
                 self.add_child(key, item)
 
+    @property
+    def privilege(self) -> List[Privilege]:
+        return self.lookup.get("privilege", [])
+
+    @property
+    def shelluser(self) -> List[User]:
+        return self.lookup.get("shelluser", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -65,24 +75,6 @@ class SecureShell(Shell):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'SecureShell' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "privilege" and isinstance(child, Privilege):
-            self.privilege.append(child)
-            child.parent = self
-
-        elif key == "shelluser" and isinstance(child, User):
-            self.shelluser.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_secureshell(self, *args):  # noqa F811
         pass
 
@@ -91,6 +83,12 @@ class SecureShell(Shell):
     # Random string that acts as an indicator for a finished shell output
     SEPARATOR = "".join(random.choice(string.ascii_lowercase) for i in range(10))
 
+    # 'coloring and formatting' special characters in the shells output
+    ANSI_ESCAPE = re.compile(r"(\x9B|\x1B\[)[0-?]*[ -/]*[@-~]")
+
+    # Number of bytes read at once from an exec channel
+    CHUNK_SIZE = 32768
+
     def init_secureshell(self, *args):  # noqa F811
         """
         Creates a wrapper for a Python socket shells.
@@ -102,13 +100,9 @@ class SecureShell(Shell):
 
         """
 
-        # Set up Client and Keys.
-        self._shell = paramiko.SSHClient()
-        self._shell.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-        self._shell.load_system_host_keys(filename=None)
-
+        # Get an authenticated Transport from the pool, shells of the same user share its connection.
         try:
-            self._shell.connect(args[2], username=args[0], password=args[1], port=args[3])
+            self._transport = ssh_pool.connect(args[2], args[3], args[0], args[1])
             # AuthenticationException – if authentication failed
             # SSHException – if there was any other error connecting or establishing an SSH session
             # socket.error – if a socket error occurred while connecting
@@ -123,12 +117,17 @@ class SecureShell(Shell):
             raise paramiko.SSHException
 
         try:
-            self.channel = self._shell.invoke_shell()
+            self.channel = self._transport.open_session()
+            self.channel.get_pty()
+            self.channel.invoke_shell()
             # Raises: SSHException – if the request was rejected or the channel was closed
         except paramiko.SSHException:
             self._logger.debug("Cannot open SSH Channel, due to SSHException from paramiko. (2)")
             raise paramiko.SSHException
 
+        # set, when a command started a nested shell. Commands in exec channels would not run in it.
+        self.nested = False
+
         # create stdin/stdout buffer
         self.stdin = self.channel.makefile("wb")
         self.stdout = self.channel.makefile("r")
@@ -199,12 +198,7 @@ class SecureShell(Shell):
                     break
 
                 else:  # get rid of 'coloring and formatting' special characters and append to known output.
-                    shout.append(
-                        re.compile(r"(\x9B|\x1B\[)[0-?]*[ -/]*[@-~]")
-                        .sub("", line)
-                        .replace("\b", "")
-                        .replace("\r", "")
-                    )
+                    shout.append(self.ANSI_ESCAPE.sub("", line).replace("\b", "").replace("\r", ""))
 
         except socket.timeout:
             raise ShellTimeoutError
@@ -212,7 +206,61 @@ class SecureShell(Shell):
         self._logger.debug("Command: " + command + " ~> exit status: " + str(exit_status))
 
         if new_shell:
+            self.nested = True
             self.stdin.write("PS1='\\$ '" + "\n")
             self.stdin.flush()
 
         return shout
+
+    def execute_command(self, command, timeout=10):
+        """
+        Executes a non-interactive command in its own exec channel and returns its output. The output is framed by the
+        channel, so neither a separator nor a wide terminal is needed, and it is read in chunks instead of lines.
+        Falls back to the interactive shell, when a nested shell was started, e.g. after a privilege escalation.
+
+        :param command: Command to execute. (String)
+        :param timeout: Number of seconds after which to raise a ShellTimeoutError exception. (int)
+
+        :return: The commands output. (List of Strings)
+        """
+
+        if self.nested:
+            return self.execute(command, timeout=timeout)
+
+        try:
+            channel = self._transport.open_session()
+        except paramiko.SSHException:
+            self._logger.debug("Cannot open exec channel, falling back to the interactive shell.")
+            return self.execute(command, timeout=timeout)
+
+        chunks = []
+        try:
+            channel.settimeout(timeout)
+            # the interactive shell merges stderr into stdout as well
+            channel.set_combine_stderr(True)
+            channel.exec_command(command)
+
+            chunk = channel.recv(self.CHUNK_SIZE)
+            while chunk:
+                chunks.append(chunk)
+                chunk = channel.recv(self.CHUNK_SIZE)
+            exit_status = channel.recv_exit_status()
+
+        except socket.timeout:
+            raise ShellTimeoutError
+        finally:
+            channel.close()
+
+        self._logger.debug("Command: " + command + " ~> exit status: " + str(exit_status))
+
+        output = b"".join(chunks).decode("utf-8", errors="replace")
+        return self.ANSI_ESCAPE.sub("", output).replace("\b", "").replace("\r", "").splitlines(keepends=True)
+
+    def concurrent_commands(self):
+        """
+        Checks if several commands can be executed with execute_command at the same time.
+
+        :return: True, unless a nested shell was started. (boolean)
+        """
+
+        return not self.nested
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.port import Port
@@ -27,6 +30,20 @@ class Service(Knowledge):
     Describes an Object of the Type Service. A service is a program, that is accessible from the outside.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {
+        "port": (Port, SINGLETON),
+        "service_name": (Name, SINGLETON),
+        "service_version": (Version, SINGLETON),
+        "protocol": (Protocol, SINGLETON),
+        "transport": (Transport, SINGLETON),
+        "status": (Status, SINGLETON),
+        "extrainfo": (ExtraInfo, LIST),
+    }
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Service.
@@ -35,37 +52,40 @@ class Service(Knowledge):
         super().__init__()
         self.init_service(*args)
 
-        self.port = []
+        for key, item in kwargs.items():
+            if isinstance(item, list):
+                for element in item:
+                    self.add_child(key, element)
+            else:
+                self.add_child(key, item)
 
-        self.service_name = []
+    @property
+    def port(self) -> List[Port]:
+        return self.lookup.get("port", [])
 
-        self.service_version = []
+    @property
+    def service_name(self) -> List[Name]:
+        return self.lookup.get("service_name", [])
 
-        self.protocol = []
+    @property
+    def service_version(self) -> List[Version]:
+        return self.lookup.get("service_version", [])
 
-        self.transport = []
+    @property
+    def protocol(self) -> List[Protocol]:
+        return self.lookup.get("protocol", [])
 
-        self.status = []
+    @property
+    def transport(self) -> List[Transport]:
+        return self.lookup.get("transport", [])
 
-        self.extrainfo = []
+    @property
+    def status(self) -> List[Status]:
+        return self.lookup.get("status", [])
 
-        self.type = "BRANCH"
-        self.lookup = {
-            "port": self.port,
-            "service_name": self.service_name,
-            "service_version": self.service_version,
-            "protocol": self.protocol,
-            "transport": self.transport,
-            "status": self.status,
-            "extrainfo": self.extrainfo,
-        }
-
-        for key, item in kwargs.items():
-            if isinstance(item, list):
-                for element in item:
-                    self.add_child(key, element)
-            else:
-                self.add_child(key, item)
+    @property
+    def extrainfo(self) -> List[ExtraInfo]:
+        return self.lookup.get("extrainfo", [])
 
     def __str__(self):
         return self.__class__.__name__
@@ -78,44 +98,6 @@ class Service(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Service' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "port" and isinstance(child, Port):
-            self.port.append(child)
-            child.parent = self
-
-        elif key == "service_name" and isinstance(child, Name):
-            self.service_name.append(child)
-            child.parent = self
-
-        elif key == "service_version" and isinstance(child, Version):
-            self.service_version.append(child)
-            child.parent = self
-
-        elif key == "protocol" and isinstance(child, Protocol):
-            self.protocol.append(child)
-            child.parent = self
-
-        elif key == "transport" and isinstance(child, Transport):
-            self.transport.append(child)
-            child.parent = self
-
-        elif key == "status" and isinstance(child, Status):
-            self.status.append(child)
-            child.parent = self
-
-        elif key == "extrainfo" and isinstance(child, ExtraInfo):
-            self.extrainfo.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_service(self, *args):  # noqa F811
         pass
 
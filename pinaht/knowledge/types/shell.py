@@ -12,6 +12,10 @@ class Shell(Knowledge):
     Describes an Object of the Type Shell.
     """
 
+    __slots__ = ()
+
+    type = "ABSTRACT"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Shell.
@@ -20,9 +24,6 @@ class Shell(Knowledge):
         super().__init__()
         self.init_shell(*args)
 
-        self.type = "ABSTRACT"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -38,16 +39,6 @@ class Shell(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Shell' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_shell(self, *args):  # noqa F811
         pass
 
@@ -63,6 +54,38 @@ class Shell(Knowledge):
         """
         pass
 
+    def execute_stream(self, command, timeout=10, new_shell=False):
+        """
+        Executes a command in the shell and iterates over its output lines. Shells without streaming yield them after
+        the command has finished.
+
+        :param command: command to execute
+        :param timeout: number of seconds after which to raise a ShellTimeoutError exception
+        :param new_shell: whether the command starts a new shell
+        :return: iterator over the output lines
+        """
+        yield from self.execute(command, timeout=timeout, new_shell=new_shell)
+
+    def execute_command(self, command, timeout=10):
+        """
+        Executes a non-interactive command and returns its output. The command must not depend on or change the
+        state of the shell (working directory, environment, nested shells). Shells without a separate channel for
+        such commands execute it like any other command.
+
+        :param command: command to execute
+        :param timeout: number of seconds after which to raise a ShellTimeoutError exception
+        :return: shell output
+        """
+        return self.execute(command, timeout=timeout)
+
+    def concurrent_commands(self) -> bool:
+        """
+        Checks if several commands can be executed with execute_command at the same time.
+
+        :return: true if the commands are executed in separate channels, otherwise false
+        """
+        return False
+
     def check(self):
         """
         Checks if the shell is functional (i.e. executes commands).
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.shell import Shell
@@ -14,11 +17,28 @@ from pinaht.knowledge.types.privilege import Privilege
 from pinaht.knowledge.types.user import User
 
 
+from pinaht.knowledge.types.shell import ShellTimeoutError
+
+from itertools import count
+
+import random
+
+import string
+
+import socket
+
+import time
+
+
 class SocketShell(Shell):
     """
     Wraps Python socket shells.
     """
 
+    type = "BRANCH"
+
+    schema = {"privilege": (Privilege, SINGLETON), "shelluser": (User, SINGLETON)}
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class SocketShell.
@@ -27,13 +47,6 @@ class SocketShell(Shell):
         super().__init__()
         self.init_socketshell(*args)
 
-        self.privilege = []
-
-        self.shelluser = []
-
-        self.type = "BRANCH"
-        self.lookup = {"privilege": self.privilege, "shelluser": self.shelluser}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -41,6 +54,14 @@ class SocketShell(Shell):
             else:
                 self.add_child(key, item)
 
+    @property
+    def privilege(self) -> List[Privilege]:
+        return self.lookup.get("privilege", [])
+
+    @property
+    def shelluser(self) -> List[User]:
+        return self.lookup.get("shelluser", [])
+
     def __str__(self):
         return self.__class__.__name__
 
@@ -52,29 +73,17 @@ class SocketShell(Shell):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'SocketShell' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "privilege" and isinstance(child, Privilege):
-            self.privilege.append(child)
-            child.parent = self
-
-        elif key == "shelluser" and isinstance(child, User):
-            self.shelluser.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_socketshell(self, *args):  # noqa F811
         pass
 
     ### USER DEFINED METHODS ### # noqa: E266
 
+    # Random string that acts as an indicator for a finished shell output
+    SEPARATOR = "".join(random.choice(string.ascii_lowercase) for i in range(10))
+
+    # Initial size of the receive buffer, it grows for longer lines
+    BUFFER_SIZE = 65536
+
     def init_socketshell(self, *args):  # noqa F811
         """
         Creates a wrapper for a Python socket shell.
@@ -83,14 +92,83 @@ class SocketShell(Shell):
         """
         super().__init__()
         self._shell = args[0]
+        # numbers the separators of the commands
+        self._commands = count()
 
     def execute(self, command, timeout=10, new_shell=False):
         """
-        Executes a command in the shell and returns its output.
+        Executes a command in the shell and returns its output. The output is framed by separators and received into
+        one buffer, that only grows for lines longer than it.
 
         :param command: command to execute
         :param timeout: number of seconds after which to raise a ShellTimeoutError exception
+        :param new_shell: whether the command starts a new shell
         :return: shell output
         """
-        self._shell.send(str.encode(command, encoding="utf-8"))
-        return str(self._shell.recv(1024), "utf-8")
+        # the outputs of previous commands end with other separators
+        separator = f"{self.SEPARATOR}{next(self._commands)}"
+        self._shell.sendall(f"echo {separator};{command};echo {separator}\n".encode("utf-8"))
+        deadline = time.monotonic() + timeout
+
+        buffer = bytearray(self.BUFFER_SIZE)
+        # the received bytes are buffer[start:end], no end of line is before position searched
+        start = end = searched = 0
+        started = False
+        output = []
+
+        while True:
+            newline = buffer.find(b"\n", searched, end)
+            if newline < 0:
+                if end == len(buffer):
+                    # move the incomplete line to the front, grow the buffer only if it is full anyway
+                    buffer[: end - start] = buffer[start:end]
+                    end -= start
+                    start = 0
+                    if end == len(buffer):
+                        buffer.extend(bytes(len(buffer)))
+                searched = end
+                end += self.receive(buffer, end, deadline)
+                continue
+
+            line = buffer[start:newline].decode("utf-8", errors="replace").rstrip("\r")
+            start = searched = newline + 1
+
+            if not started:
+                # skip everything before the first separator, an echoed command ends with it too
+                started = line.endswith(separator) and not line.endswith("echo " + separator)
+                if started and new_shell:  # send a second echo to recognize the end in the new shell
+                    self._shell.sendall(f"echo {separator}\n".encode("utf-8"))
+            elif line.endswith(separator):
+                line = line.rpartition(separator)[0]
+                if line:
+                    output.append(line)
+                return output
+            else:
+                output.append(line)
+
+    def receive(self, buffer, position, deadline):
+        """
+        Receives bytes into the buffer without copying them.
+
+        :param buffer: the buffer to receive into
+        :param position: the position in the buffer, where the received bytes are written to
+        :param deadline: the time.monotonic() after which to raise a ShellTimeoutError exception
+        :return: the number of received bytes
+        """
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            self._logger.error("command timeout expired")
+            raise ShellTimeoutError
+
+        self._shell.settimeout(remaining)
+        try:
+            with memoryview(buffer) as view:
+                received = self._shell.recv_into(view[position:])
+        except socket.timeout:
+            self._logger.error("command timeout expired")
+            raise ShellTimeoutError
+
+        if received == 0:
+            self._logger.error("shell connection closed")
+            raise ShellTimeoutError
+        return received
@@ -0,0 +1,161 @@
+from typing import Dict, Tuple, Iterable, Optional
+import logging
+import threading
+import paramiko
+
+
+class SSHConnectionPool:
+    """
+    Keeps one authenticated SSH transport per (host, port, user) alive, so that all shells of a user share one
+    connection. Every shell and every command opens its own channel on the shared transport.
+    """
+
+    def __init__(self, keepalive: int = 30):
+        """
+        :param keepalive: the interval in seconds of the keepalive packets, no keepalive if 0
+        """
+
+        self.keepalive = keepalive
+        self.transports: Dict[Tuple[str, int, str], Tuple[paramiko.Transport, str]] = {}
+        self.locks: Dict[Tuple[str, int, str], threading.Lock] = {}
+        self.lock = threading.Lock()
+        self._logger = logging.getLogger(self.__class__.__name__)
+
+    def connect(self, host: str, port: int, user: str, password: str) -> paramiko.Transport:
+        """
+        returns the pooled transport of the user, if it is still active and was authenticated with the same
+        password, otherwise connects and authenticates a new one.
+
+        :param host: the host the SSH-Service runs on
+        :param port: the port the SSH-Service runs on
+        :param user: the user to log into
+        :param password: the password to use
+        :return: the authenticated transport
+        :raises paramiko.AuthenticationException: if the authentication failed
+        :raises paramiko.SSHException: if there was any other error connecting or establishing an SSH session
+        :raises socket.error: if a socket error occurred while connecting
+        """
+
+        key = (host, port, user)
+        with self.lock:
+            lock = self.locks.setdefault(key, threading.Lock())
+
+        # transports of different users are established at the same time, the ones of a user one after another
+        with lock:
+            transport = self.pooled(key, password)
+            if transport is not None:
+                self._logger.debug(f"reusing the connection of {user} to {host}:{port}")
+                return transport
+
+            transport = self.open(host, port)
+            try:
+                transport.auth_password(user, password)
+            except Exception:
+                transport.close()
+                raise
+
+            self.add(key, transport, password)
+            return transport
+
+    def authenticate(
+        self, host: str, port: int, user: str, passwords: Iterable[str], stop: Optional[threading.Event] = None
+    ) -> Optional[str]:
+        """
+        tries the passwords of a user one after another. the attempts share one negotiated transport, until the
+        server closes it, e.g. after too many failed attempts. the transport of the valid password is pooled.
+
+        :param host: the host the SSH-Service runs on
+        :param port: the port the SSH-Service runs on
+        :param user: the user to log into
+        :param passwords: the passwords to try
+        :param stop: no more passwords are tried, when the event is set
+        :return: the valid password or None, if none of the tried passwords is valid
+        :raises paramiko.SSHException: if there was any other error connecting or establishing an SSH session
+        :raises socket.error: if a socket error occurred while connecting
+        """
+
+        transport = None
+        try:
+            for password in passwords:
+                if stop is not None and stop.is_set():
+                    return None
+
+                for retry in (False, True):
+                    if transport is None:
+                        transport = self.open(host, port)
+                    try:
+                        transport.auth_password(user, password)
+                    except paramiko.BadAuthenticationType:
+                        self._logger.debug(f"{host}:{port} does not allow password authentication")
+                        return None
+                    except paramiko.AuthenticationException:
+                        break
+                    except (paramiko.SSHException, EOFError):
+                        # the server has closed the transport, the password is tried once more on a new one
+                        transport.close()
+                        transport = None
+                        if retry:
+                            raise
+                    else:
+                        self.add((host, port, user), transport, password)
+                        transport = None
+                        return password
+        finally:
+            if transport is not None:
+                transport.close()
+
+        return None
+
+    def open(self, host: str, port: int) -> paramiko.Transport:
+        """
+        connects to the SSH-Service and negotiates a transport. like paramiko.AutoAddPolicy, every host key is
+        accepted.
+
+        :param host: the host the SSH-Service runs on
+        :param port: the port the SSH-Service runs on
+        :return: the unauthenticated transport
+        """
+
+        transport = paramiko.Transport((host, port))
+        try:
+            transport.start_client()
+        except Exception:
+            transport.close()
+            raise
+
+        if self.keepalive > 0:
+            transport.set_keepalive(self.keepalive)
+        return transport
+
+    def pooled(self, key: Tuple[str, int, str], password: str) -> Optional[paramiko.Transport]:
+        """
+        :return: the pooled transport, if it is active and was authenticated with the password, otherwise None
+        """
+
+        with self.lock:
+            transport, pooled_password = self.transports.get(key, (None, None))
+        if transport is not None and pooled_password == password and transport.is_active():
+            return transport
+        return None
+
+    def add(self, key: Tuple[str, int, str], transport: paramiko.Transport, password: str):
+        """
+        pools an authenticated transport. a replaced transport stays open for the shells, that still use it.
+        """
+
+        with self.lock:
+            self.transports[key] = (transport, password)
+
+    def close(self):
+        """
+        closes all pooled transports
+        """
+
+        with self.lock:
+            for transport, password in self.transports.values():
+                transport.close()
+            self.transports.clear()
+
+
+# the transports shared by all secure shells
+ssh_pool = SSHConnectionPool()
@@ -4,7 +4,10 @@
 # Date: -
 ###############################################################################
 
-from pinaht.knowledge.types.knowledge import Knowledge  # noqa F401
+from pinaht.knowledge.types.knowledge import Knowledge, SINGLETON, LIST  # noqa F401
+
+
+from typing import List
 
 
 from pinaht.knowledge.types.service import Service
@@ -31,6 +34,22 @@ class Target(Knowledge):
     Describes an Object of the Type Target. A target is one specific computer Pinaht tries to hack.
     """
 
+    __slots__ = ("_parent", "_ancestors", "duality_edges", "lookup")
+
+    type = "BRANCH"
+
+    schema = {
+        "services": (Service, LIST),
+        "os": (OS, SINGLETON),
+        "address": (IPAddress, SINGLETON),
+        "shells": (Shell, LIST),
+        "status": (Status, SINGLETON),
+        "hostname": (Name, LIST),
+        "login_user": (LoginUser, LIST),
+        "credentials": (Credentials, SINGLETON),
+        "filesystem": (FsTree, SINGLETON),
+    }
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Target.
@@ -39,43 +58,48 @@ class Target(Knowledge):
         super().__init__()
         self.init_target(*args)
 
-        self.services = []
+        for key, item in kwargs.items():
+            if isinstance(item, list):
+                for element in item:
+                    self.add_child(key, element)
+            else:
+                self.add_child(key, item)
 
-        self.os = []
+    @property
+    def services(self) -> List[Service]:
+        return self.lookup.get("services", [])
 
-        self.address = []
+    @property
+    def os(self) -> List[OS]:
+        return self.lookup.get("os", [])
 
-        self.shells = []
+    @property
+    def address(self) -> List[IPAddress]:
+        return self.lookup.get("address", [])
 
-        self.status = []
+    @property
+    def shells(self) -> List[Shell]:
+        return self.lookup.get("shells", [])
 
-        self.hostname = []
+    @property
+    def status(self) -> List[Status]:
+        return self.lookup.get("status", [])
 
-        self.login_user = []
+    @property
+    def hostname(self) -> List[Name]:
+        return self.lookup.get("hostname", [])
 
-        self.credentials = []
+    @property
+    def login_user(self) -> List[LoginUser]:
+        return self.lookup.get("login_user", [])
 
-        self.filesystem = []
+    @property
+    def credentials(self) -> List[Credentials]:
+        return self.lookup.get("credentials", [])
 
-        self.type = "BRANCH"
-        self.lookup = {
-            "services": self.services,
-            "os": self.os,
-            "address": self.address,
-            "shells": self.shells,
-            "status": self.status,
-            "hostname": self.hostname,
-            "login_user": self.login_user,
-            "credentials": self.credentials,
-            "filesystem": self.filesystem,
-        }
-
-        for key, item in kwargs.items():
-            if isinstance(item, list):
-                for element in item:
-                    self.add_child(key, element)
-            else:
-                self.add_child(key, item)
+    @property
+    def filesystem(self) -> List[FsTree]:
+        return self.lookup.get("filesystem", [])
 
     def __str__(self):
         return self.__class__.__name__
@@ -88,52 +112,6 @@ class Target(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Target' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        if key == "services" and isinstance(child, Service):
-            self.services.append(child)
-            child.parent = self
-
-        elif key == "os" and isinstance(child, OS):
-            self.os.append(child)
-            child.parent = self
-
-        elif key == "address" and isinstance(child, IPAddress):
-            self.address.append(child)
-            child.parent = self
-
-        elif key == "shells" and isinstance(child, Shell):
-            self.shells.append(child)
-            child.parent = self
-
-        elif key == "status" and isinstance(child, Status):
-            self.status.append(child)
-            child.parent = self
-
-        elif key == "hostname" and isinstance(child, Name):
-            self.hostname.append(child)
-            child.parent = self
-
-        elif key == "login_user" and isinstance(child, LoginUser):
-            self.login_user.append(child)
-            child.parent = self
-
-        elif key == "credentials" and isinstance(child, Credentials):
-            self.credentials.append(child)
-            child.parent = self
-
-        elif key == "filesystem" and isinstance(child, FsTree):
-            self.filesystem.append(child)
-            child.parent = self
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_target(self, *args):  # noqa F811
         pass
 
@@ -12,6 +12,8 @@ class Version(Knowledge):
     Describes an Object of the Type Version.
     """
 
+    type = "LEAF_CUSTOM"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class Version.
@@ -20,9 +22,6 @@ class Version(Knowledge):
         super().__init__()
         self.init_version(*args)
 
-        self.type = "LEAF_CUSTOM"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -38,16 +37,6 @@ class Version(Knowledge):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'Version' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_version(self, *args):  # noqa F811
         pass
 
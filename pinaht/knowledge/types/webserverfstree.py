@@ -18,6 +18,8 @@ class WebserverFsTree(FsTree):
     Tree structure mirroring a webserver's filesystem
     """
 
+    type = "LEAF_CUSTOM"
+
     def __init__(self, *args, **kwargs):
         """
         Constructor of the class WebserverFsTree.
@@ -26,9 +28,6 @@ class WebserverFsTree(FsTree):
         super().__init__()
         self.init_webserverfstree(*args)
 
-        self.type = "LEAF_CUSTOM"
-        self.lookup = {}
-
         for key, item in kwargs.items():
             if isinstance(item, list):
                 for element in item:
@@ -44,16 +43,6 @@ class WebserverFsTree(FsTree):
             return 0.0
         return 0.5
 
-    def add_child(self, key, child):
-        if key not in self.lookup:
-            raise ValueError(
-                f"Type 'WebserverFsTree' has no child/attribute with name {key}. "
-                "Check types.yaml or the generated PDF for correct identifiers."
-            )
-
-        else:
-            raise TypeError(f"Child for attribute {key} is not of the right type")
-
     def init_webserverfstree(self, *args):  # noqa F811
         pass
 
@@ -25,6 +25,9 @@ class ApacheOpenfuckModule(Module):
     Exploit-DB: https://www.exploit-db.com/exploits/764
     """
 
+    # the spawned shell is stored in self._shell
+    concurrent = False
+
     def __init__(self, manager, file_manager: FileManager, **kwargs):
         super().__init__(manager, **kwargs)
 
@@ -11,29 +11,39 @@ from pinaht.knowledge.types.target import Target
 from pinaht.knowledge.types.port import Port
 from pinaht.knowledge.types.credentials import Credentials
 from pinaht.knowledge.types.name import Name
+from pinaht.modules.http_util import create_session
 from typing import Tuple, Dict
+from concurrent.futures import ThreadPoolExecutor
 import requests
+import uuid
 from pinaht.reporting.report_util import str_to_latex
 
 NAMES_LIST = "unix_users.txt"
 
+WORKERS = 16
+TIMEOUT = 5  # seconds
+
 
 class ApacheUserdirModule(Module):
     """
     Extracts usernames from an apache server with the userdir module enabled.
     """
 
-    def __init__(self, manager, file_manager: FileManager, **kwargs):
+    def __init__(self, manager, file_manager: FileManager, workers: int = WORKERS, **kwargs):
+        """
+        :param workers: the number of usernames, that are probed at the same time
+        """
         super().__init__(manager, **kwargs)
 
         self._file_manager = file_manager
+        self.workers = workers
 
         usernames_file = self._file_manager.get_file("ApacheUserdirModule", NAMES_LIST)
         read_data = usernames_file.read()
         usernames_file.close()
-        self.user_names_list = read_data.split("\n")
+        self.user_names_list = [name for name in read_data.split("\n") if name]
 
-        self.estimated_time = float(len(self.user_names_list)) * 0.05
+        self.estimated_time = float(len(self.user_names_list)) * 0.05 / self.workers
         self.success_chance = 0.1
 
     def _generate_precondition_dnf(self) -> Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]]:
@@ -76,14 +86,17 @@ class ApacheUserdirModule(Module):
             wordlist \\code{{{str_to_latex(NAMES_LIST)}}} in the module directory."""
         )
 
-        found_usernames = []
-        for potential_user in self.user_names_list:
-            request_string = "http://" + str(ip_address) + "/~" + potential_user + "/"
-            response = requests.get(request_string)
-            if response.status_code == 200:
-                found_usernames.append(potential_user)
+        with create_session(self.workers) as session:
+            # a server, that answers with 200 for a random name, would do so for every name
+            if self.probe(session, ip_address, uuid.uuid4().hex):
+                buffered_module_manager.report("The server answers every path with HTTP Statuscode 200, aborting.")
+                return
+
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                found = executor.map(lambda name: self.probe(session, ip_address, name), self.user_names_list)
+                found_usernames = [name for name, exists in zip(self.user_names_list, found) if exists]
 
-        if len(target.lookup["credentials"]) == 0:
+        if len(target.credentials) == 0:
             cred = Credentials()
             buffered_module_manager.add_knowledge(target, "credentials", cred, 1.0)
             for name in found_usernames:
@@ -91,5 +104,22 @@ class ApacheUserdirModule(Module):
                 buffered_module_manager.report(f"Found username \\code{{{str_to_latex(name)}}}.")
         else:
             for name in found_usernames:
-                buffered_module_manager.add_knowledge(target.lookup["credentials"][0], "users", Name(name), 1.0)
+                buffered_module_manager.add_knowledge(target.credentials[0], "users", Name(name), 1.0)
                 buffered_module_manager.report(f"Found username \\code{{{str_to_latex(name)}}}.")
+
+    @staticmethod
+    def probe(session: requests.Session, ip_address: IPAddress, name: str) -> bool:
+        """
+        checks whether the userdir of a user exists, with a HEAD request if the server allows it
+
+        :return: True if the server answers with HTTP Statuscode 200
+        """
+        url = f"http://{ip_address!s}/~{name}/"
+        try:
+            response = session.head(url, timeout=TIMEOUT, allow_redirects=True)
+            if response.status_code in (405, 501):
+                # HEAD is not allowed
+                response = session.get(url, timeout=TIMEOUT)
+        except requests.exceptions.RequestException:
+            return False
+        return response.status_code == 200
@@ -92,11 +92,11 @@ class CredentialsExtractModule(Module):
             "Starting to search for interesting files in the underlying filesystem object..."
         )
 
-        if len(target.lookup["credentials"]) == 0:
+        if len(target.credentials) == 0:
             cred = Credentials()
             buffered_module_manager.add_knowledge(target, "credentials", cred, 1.0)
         else:
-            cred = target.lookup["credentials"][0]
+            cred = target.credentials[0]
 
         list_of_files = fsystem.get_all_files()
         for file in list_of_files:
@@ -32,6 +32,9 @@ class DecryptModule(Module):
         cred_precondition = check_type(Credentials)
 
         class ValidBasePasswordPrecondition(Precondition):
+            accepted_types = (Password,)
+            cached = True
+
             def __init__(self, **kwargs):
                 super(ValidBasePasswordPrecondition, self).__init__(**kwargs)
 
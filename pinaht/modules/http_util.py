@@ -0,0 +1,50 @@
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def create_session(pool_size: int) -> requests.Session:
+    """
+    creates a session, that keeps up to pool_size connections per host alive.
+
+    :param pool_size: the number of threads, that use the session at the same time
+    :return: the session
+    """
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class RateLimiter:
+    """
+    limits the rate of requests over all threads
+    """
+
+    def __init__(self, rate: float):
+        """
+        :param rate: the maximum number of requests per second, no limit if 0
+        """
+
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self.next_time = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        """
+        blocks until the next request may be sent
+        """
+
+        if self.interval == 0.0:
+            return
+
+        with self.lock:
+            now = time.monotonic()
+            wait_time = self.next_time - now
+            self.next_time = max(now, self.next_time) + self.interval
+
+        if wait_time > 0:
+            time.sleep(wait_time)
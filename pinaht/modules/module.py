@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
+import asyncio
 import logging
 from pinaht.knowledge.precondition import Precondition, MetaPrecondition
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Set, Hashable
 from pinaht.knowledge.dependency import Dependency
 from pinaht.knowledge.manager import BufferedModuleManager
 from pinaht.knowledge.types.knowledge import Knowledge
@@ -16,13 +17,24 @@ class Module(ABC):
     Base class for all the modules
     """
 
+    # whether the module can be executed several times at the same time, see Application.run_concurrent
+    concurrent = True
+
+    # whether the module only uses Shell.execute_command, so that shells with concurrent commands are not used
+    # exclusively, see Application.resources
+    shares_shells = False
+
+    # whether the dependency resolves only the new groupings, see Dependency. it is not, if a metaprecondition is not
+    # monotonic
+    incremental = True
+
     def __init__(self, manager, **kwargs):
         super(Module, self).__init__()
         self.estimated_time = None
         self.success_chance = None
 
         self.precondition_dnf_cache = None
-        self.dependency = Dependency(self.precondition_dnf())
+        self.dependency = Dependency(self.precondition_dnf(), self.incremental)
 
         manager.register(self.dependency)
 
@@ -47,3 +59,22 @@ class Module(ABC):
         executes the module
         """
         raise NotImplementedError()
+
+    async def execute_async(
+        self, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict[str, Knowledge]
+    ):
+        """
+        executes the module in an asyncio event loop, see Application.run_async.
+        modules with asynchronous I/O can override this, by default execute runs in the executor of the loop.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.execute, buffered_module_manager, meta_key, keyed_knowledge)
+
+    def resources(self, meta_key: str, keyed_knowledge: Dict[str, Knowledge]) -> Set[Hashable]:
+        """
+        the resources, that an execution needs exclusively in addition to its shells, see Application.resources.
+        executions of modules, that do the work of other executions, can exclude each other with them.
+
+        :return: a set of hashable resources
+        """
+        return set()
@@ -1,4 +1,4 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, Callable, List, Union, Optional, Set
 from pinaht.modules.module import Module
 from libnmap.process import NmapProcess
 from libnmap.parser import NmapParser
@@ -27,10 +27,46 @@ from pinaht.knowledge.types.text import Text
 from pinaht.knowledge.types.knowledge import Knowledge
 from pinaht.knowledge.manager import BufferedModuleManager
 from functools import reduce
+from xml.etree import ElementTree
 from pinaht.util import list_str
 from pinaht.reporting.report_util import str_to_latex
 
 
+DEEP_OPTIONS = "--version-all -sC -A -sS -O -T4"
+# finds the targets of a network and their most common open ports
+SWEEP_OPTIONS = "-sS -T4 --top-ports 100"
+UNPRIVILEGED_SWEEP_OPTIONS = "-sT -T4 --top-ports 100"
+# the number of targets per deep scan
+BATCH_SIZE = 16
+
+
+class NmapHostStream:
+    """
+    parses the xml output of a running nmap process incrementally
+    """
+
+    def __init__(self):
+        self.parser = ElementTree.XMLPullParser(events=("end",))
+        self.position = 0
+
+    def feed(self, stdout: str) -> List[NmapHost]:
+        """
+        parses the output, that has been added since the last call
+
+        :param stdout: the whole output of nmap so far
+        :return: the hosts, that have been completed since the last call
+        """
+        position, self.position = self.position, len(stdout)
+        self.parser.feed(stdout[position:])
+
+        hosts = []
+        for _, element in self.parser.read_events():
+            if element.tag == "host":
+                hosts.append(NmapParser.parse(ElementTree.tostring(element, encoding="unicode")))
+                element.clear()
+        return hosts
+
+
 class NmapModule(Module):
     def __init__(self, manager, **kwargs):
         super(NmapModule, self).__init__(manager, **kwargs)
@@ -50,82 +86,184 @@ class NmapModule(Module):
             self.execute_network_scan(buffered_module_manager, **keyed_knowledge)
 
     def execute_network_scan(self, buffered_module_manager, network, mask, ip):
+        """
+        scans the network in two phases: a sweep over the whole network finds the targets and their open ports,
+        then the targets with open ports are scanned in depth on these ports, several targets per nmap call.
+        the deep scan replaces the target scan of these targets.
+        """
+        network_targets = f"{ip!s}/{mask!s}"
         buffered_module_manager.report(
-            f"""Starting nmap networkscan on \\code{{{ip!s}/{mask!s}}} with command:
-            \\code{{sudo nmap -sn {ip!s}/{mask!s}}}"""
+            f"""Starting nmap networkscan on \\code{{{network_targets}}} with command:
+            \\code{{sudo nmap {SWEEP_OPTIONS} {network_targets}}}"""
+        )
+
+        known_target = list(
+            reduce(lambda A, B: A + B, map(lambda t: t.address, filter(lambda t: t.address, network.targets)), [])
+        )
+        local_host_ip = list(
+            reduce(lambda A, B: A + B, map(lambda h: h.address, filter(lambda h: h.address, network.local_host)), [])
         )
-        scanner = NmapProcess(f"{ip!s}/{mask!s}", options="-sn")
-        scanner.sudo_run()
+        # maps the address of the found targets with open ports to the target, its ip and the open ports
+        open_targets = {}  # type: Dict[str, Tuple[Target, IPAddress, List[int]]]
+
+        def handle_host(host: NmapHost):
+            if not host.is_up():
+                return
+            host_ip = IPAddress(IPAddress.str_to_ip(host.address))
+            if host_ip in known_target or host_ip in local_host_ip:
+                return
+
+            buffered_module_manager.report(f"Target \\code{{{host_ip!s}}} has been found.")
+            target = Target(address=host_ip)
+            buffered_module_manager.add_knowledge(network, "targets", target, 1.0, True)
+
+            ports = [service.port for service in host.services if service.open()]
+            if ports:
+                # the deep scan below replaces the target scan
+                buffered_module_manager.add_executed(
+                    self.dependency, "nmap_target_with_ip", {"target": target, "ip": host_ip}
+                )
+                open_targets[host.address] = (target, host_ip, ports)
+
+        # the hosts, that the failed run has already handled, are skipped by the retry
+        handled = set()  # type: Set[str]
+        scanner = self.scan(buffered_module_manager, network_targets, SWEEP_OPTIONS, handle_host, handled=handled)
 
         if scanner.has_failed():
             stderr = str.split(scanner.stderr, sep="\n")[0]
             buffered_module_manager.report(f"Nmap scan failed due to {str_to_latex(str(stderr))}.")
             self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Trying again.")
-            buffered_module_manager.report(f"Retrying nmap networkscan with sudo option: \\code{{nmap -sn {ip!s}}}")
-            scanner = NmapProcess(str(ip), options="-sn")
-            scanner.run()
-
-        if scanner.is_successful():
-            report = NmapParser.parse(scanner.stdout)
-            targets = list(
-                map(lambda h: IPAddress(IPAddress.str_to_ip(h.address)), filter(lambda h: h.is_up(), report.hosts))
+            buffered_module_manager.report(
+                "Retrying nmap networkscan without sudo: "
+                + f"\\code{{nmap {UNPRIVILEGED_SWEEP_OPTIONS} {network_targets}}}"
             )
-            known_target = list(
-                reduce(lambda A, B: A + B, map(lambda t: t.address, filter(lambda t: t.address, network.targets)), [])
+            scanner = self.scan(
+                buffered_module_manager,
+                network_targets,
+                UNPRIVILEGED_SWEEP_OPTIONS,
+                handle_host,
+                sudo=False,
+                handled=handled,
             )
-            local_host_ip = list(
-                reduce(
-                    lambda A, B: A + B, map(lambda h: h.address, filter(lambda h: h.address, network.local_host)), []
-                )
+
+        if not scanner.is_successful():
+            stderr = str.split(scanner.stderr, sep="\n")[0]
+            buffered_module_manager.report(
+                f"Nmap failed to run. The reason is: \\code{{{str_to_latex(str(stderr))}}}."
             )
+            self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Exiting")
+            return
 
-            for ip in known_target:
-                if ip in targets:
-                    targets.remove(ip)
-            for ip in local_host_ip:
-                if ip in targets:
-                    targets.remove(ip)
+        remaining = list(open_targets.values())
+        while remaining:
+            batch, remaining = remaining[:BATCH_SIZE], remaining[BATCH_SIZE:]
+            self.execute_deep_scan(buffered_module_manager, batch)
 
-            for ip in targets:
-                buffered_module_manager.report(f"Target \\code{{{ip!s}}} has been found.")
-                target = Target(address=ip)
-                buffered_module_manager.add_knowledge(network, "targets", target, 1.0, True)
+    def execute_deep_scan(
+        self, buffered_module_manager: BufferedModuleManager, batch: List[Tuple[Target, IPAddress, List[int]]]
+    ):
+        """
+        scans several targets with one nmap call on the ports, that are open on any of them
+        """
+        ports = ",".join(map(str, sorted({port for target, ip, target_ports in batch for port in target_ports})))
+        targets = {str(ip): (target, ip) for target, ip, target_ports in batch}
+        buffered_module_manager.report(f"""Starting nmap portscan on {len(targets)} targets with call:
+            \\code{{sudo nmap {DEEP_OPTIONS} -p {ports} {' '.join(targets)}}}.""")
+
+        def handle_host(host: NmapHost):
+            if host.address in targets:
+                target, ip = targets[host.address]
+                self.scan_host(buffered_module_manager, target, ip, host)
+
+        handled = set()  # type: Set[str]
+        scanner = self.scan(
+            buffered_module_manager, list(targets), f"{DEEP_OPTIONS} -p {ports}", handle_host, handled=handled
+        )
 
-        else:
+        if scanner.has_failed():
             stderr = str.split(scanner.stderr, sep="\n")[0]
-            buffered_module_manager.report(
-                f"Nmap failed to run. The reason is: \\code{{{str_to_latex(str(stderr))}}}."
+            buffered_module_manager.report(f"Nmap scan failed due to \\code{{{str_to_latex(str(stderr))}}}.")
+            self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Trying again.")
+            buffered_module_manager.report(f"Retrying nmap portscan with less option: \\code{{nmap -A -p {ports}}}")
+            scanner = self.scan(
+                buffered_module_manager, list(targets), f"-A -p {ports}", handle_host, sudo=False, handled=handled
             )
+
+        if scanner.is_successful():
+            buffered_module_manager.report("Nmap scan successful executed.")
+        else:
+            stderr = str.split(scanner.stderr, sep="\n")[0]
+            buffered_module_manager.report(f"Nmap scan failed due to \\code{{{str_to_latex(str(stderr))}}}.")
             self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Exiting")
 
     def execute_target_scan(self, buffered_module_manager: BufferedModuleManager, target, ip):
         buffered_module_manager.report(
             f"Starting nmap portscan with call: \\code{{sudo nmap --version-all -sC -A -sS -O -T4 {ip!s}}}."
         )
-        scanner = NmapProcess(str(ip), options="--version-all -sC -A -sS -O -T4")
-        scanner.sudo_run()
+
+        def handle_host(host: NmapHost):
+            host_ip = IPAddress(IPAddress.str_to_ip(host.ipv4))
+            if ip == host_ip:
+                self.scan_host(buffered_module_manager, target, ip, host)
+
+        handled = set()  # type: Set[str]
+        scanner = self.scan(buffered_module_manager, str(ip), DEEP_OPTIONS, handle_host, handled=handled)
 
         if scanner.has_failed():
             stderr = str.split(scanner.stderr, sep="\n")[0]
             buffered_module_manager.report(f"Nmap scan failed due to \\code{{{str_to_latex(str(stderr))}}}.")
             self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Trying again.")
-            scanner = NmapProcess(str(ip), options="-A")
             buffered_module_manager.report(f"Retrying nmap portscan with less option: \\code{{nmap -A {ip!s}}}")
-            scanner.run()
+            scanner = self.scan(buffered_module_manager, str(ip), "-A", handle_host, sudo=False, handled=handled)
 
         if scanner.is_successful():
             buffered_module_manager.report("Nmap scan successful executed.")
-            report = NmapParser.parse(scanner.stdout)
-            for host in report.hosts:
-                host_ip = IPAddress(IPAddress.str_to_ip(host.ipv4))
-                if ip == host_ip:
-                    self.scan_host(buffered_module_manager, target, ip, host)
 
         else:
             stderr = str.split(scanner.stderr, sep="\n")[0]
             buffered_module_manager.report(f"Nmap scan failed due to \\code{{{str_to_latex(str(stderr))}}}.")
             self._logger.info(f"Nmap failed to run. The reason is: {stderr!s} Exiting")
 
+    def scan(
+        self,
+        buffered_module_manager: BufferedModuleManager,
+        targets: Union[str, List[str]],
+        options: str,
+        handle_host: Callable[[NmapHost], None],
+        sudo: bool = True,
+        handled: Optional[Set[str]] = None,
+    ) -> NmapProcess:
+        """
+        runs nmap and handles every host as soon as nmap has finished it, instead of after the whole scan.
+        libnmap calls the event callback on every progress report of nmap.
+        the knowledge of each host is flushed, so other modules can already work with it.
+
+        :param targets: the nmap targets
+        :param options: the nmap options
+        :param handle_host: called with every scanned host
+        :param sudo: whether nmap is run with sudo
+        :param handled: the addresses of the handled hosts, the hosts in it are not handled again
+        :return: the finished nmap process
+        """
+        stream = NmapHostStream()
+        if handled is None:
+            handled = set()
+
+        def event_callback(scanner: NmapProcess):
+            for host in stream.feed(scanner.stdout):
+                if host.address in handled:
+                    continue
+                handled.add(host.address)
+                handle_host(host)
+                buffered_module_manager.flush()
+
+        scanner = NmapProcess(targets, options=options, event_callback=event_callback)
+        if sudo:
+            scanner.sudo_run()
+        else:
+            scanner.run()
+        return scanner
+
     def scan_host(self, buffered_module_manager: BufferedModuleManager, target, ip, host: NmapHost):
         hostnames = host.hostnames
         if len(hostnames) == 0:
@@ -152,7 +290,9 @@ class NmapModule(Module):
             buffered_module_manager.report("Host status is unknown.")
             buffered_module_manager.add_knowledge(target, "status", Status.UNKNOWN, 0.8)
 
-        for os_class in host.os_class_probabilities():
+        # a target has one os, the most accurate guess of nmap
+        os_classes = sorted(host.os_class_probabilities(), key=lambda os_class: os_class.accuracy, reverse=True)
+        for os_class in os_classes[:1]:
             os_version = Version(Version.parse_version(os_class.osgen))
             os = OS(expected_version=os_version)
             if "windows" in str.lower(os_class.osfamily):
@@ -213,10 +353,12 @@ class NmapModule(Module):
         elif "tls" in str.lower(nmap_service.protocol):
             service.add_child("transport", Transport.TLS)
 
+        # a service has one version, the one of its first CPE
         for cpe in nmap_service.cpelist:
             if cpe is not None:
                 version = Version(Version.parse_version(cpe.get_version()))
                 service.add_child("service_version", version)
+                break
 
         if "open" in str.lower(nmap_service.state):
             service.add_child("status", Status.OPEN)
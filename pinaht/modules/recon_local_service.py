@@ -24,6 +24,9 @@ class ReconLocalService(Module):
     Services, which are added to the Knowledge-Tree, may be duplicates.
     """
 
+    # the commands are executed with Shell.execute_command
+    shares_shells = True
+
     def __init__(self, manager, **kwargs):
         super(ReconLocalService, self).__init__(manager, **kwargs)
 
@@ -45,7 +48,7 @@ class ReconLocalService(Module):
             target = keyed_knowledge["target"]
 
             # 1. Check, if dpkg is installed
-            if not len(shell.execute("which dpkg")) > 0:
+            if not len(shell.execute_command("which dpkg")) > 0:
                 self._logger.error("dpkg is not installed on target system. Aborting.")
                 return
 
@@ -60,7 +63,7 @@ class ReconLocalService(Module):
             )
 
             buffered_module_manager.report("Executing command to find local services.")
-            shout = shell.execute(  # this can take some time, depending on number of services
+            shout = shell.execute_command(  # this can take some time, depending on number of services
                 command_full, timeout=100
             )
             buffered_module_manager.report(str(len(shout)) + " Services were found: (Name, Version)")
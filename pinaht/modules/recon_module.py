@@ -13,6 +13,9 @@ from pinaht.knowledge.types.localfstree import LocalFsTree
 
 
 class ReconModule(Module):
+    # the commands are executed with Shell.execute_command
+    shares_shells = True
+
     def _generate_precondition_dnf(self) -> Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]]:
 
         target_precondition = check_type(Target)
@@ -39,7 +42,7 @@ class ReconModule(Module):
 
 def traverse_filesystem(shell):
     cmd = "find / -printf %p\\\\t%u\\\\t%g\\\\t%M\\\\n 2>/dev/null"
-    fs = shell.execute(cmd)
+    fs = shell.execute_command(cmd)
     root = File("", "", "")
 
     for file in fs:
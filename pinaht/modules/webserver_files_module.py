@@ -1,4 +1,5 @@
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from urllib.parse import urlparse, urljoin
 from bs4 import BeautifulSoup
 from typing import Dict, Tuple
@@ -10,6 +11,7 @@ from pinaht.knowledge.precondition import Precondition, MetaPrecondition
 from pinaht.knowledge.types.knowledge import Knowledge
 from pinaht.knowledge.types.port import Port
 from pinaht.modules.module import Module
+from pinaht.modules.http_util import create_session, RateLimiter
 from pinaht.knowledge.types.fstree import File
 from pinaht.knowledge.types.webserverfstree import WebserverFsTree
 from pinaht.knowledge.types.ipaddress import IPAddress
@@ -18,6 +20,12 @@ from pinaht.knowledge.types.service import Service
 
 WORDLIST = ["test", "hidden", "secret", "geheim"]
 
+WORKERS = 16
+MAX_DEPTH = 10
+MAX_PAGES = 5000
+MAX_RATE = 200.0  # requests per second
+TIMEOUT = 5  # seconds
+
 
 class WebserverFilesModule(Module):
     def _generate_precondition_dnf(self) -> Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]]:
@@ -65,10 +73,10 @@ class WebserverFilesModule(Module):
             buffered_module_manager.add_knowledge(target, "filesystem", fs_tree, 1.0)
 
 
-def get_urls(target):
+def get_urls(target, session=None):
     urls = set()
     try:
-        response = requests.get(target)
+        response = (session or requests).get(target, timeout=TIMEOUT)
         if response.status_code == 200:
             # add target itself
             urls.add(response.url)
@@ -94,19 +102,38 @@ def get_urls(target):
     return urls
 
 
-def crawl(target):
+def crawl(target, workers=WORKERS, max_depth=MAX_DEPTH, max_pages=MAX_PAGES, rate=MAX_RATE):
+    """
+    crawls the URLs of a webserver with up to workers requests at the same time.
+
+    :param target: the URL to begin with
+    :param workers: the number of concurrent requests
+    :param max_depth: the maximum number of links between target and a crawled URL
+    :param max_pages: the maximum number of requests
+    :param rate: the maximum number of requests per second, no limit if 0
+    :return: the set of found URLs
+    """
+
+    netloc = urlparse(target).netloc
+    rate_limiter = RateLimiter(rate)
     found_urls = set()
+    requested_urls = set()  # requested or in-flight URLs
+    in_flight = {}  # maps the futures to the depth of their URL
 
-    # crawl URLs recursively, beginning with target
-    urls = set({target})
-    while urls:
-        url = urls.pop()
-        new_urls = get_urls(url)
+    def fetch(url):
+        rate_limiter.wait()
+        return get_urls(url, session)
 
-        # check for secret URLs
+    def request(url, depth):
+        if url not in requested_urls and len(requested_urls) < max_pages:
+            requested_urls.add(url)
+            in_flight[executor.submit(fetch, url)] = depth
+
+    def visit(url, depth):
+        # crawl URL and check for secret URLs
+        request(url, depth)
         for word in WORDLIST:
-            new_url = urljoin(url, word)
-            new_urls.update(get_urls(new_url))
+            request(urljoin(url, word), depth)
 
         # check suburls
         parsed_url = urlparse(url)
@@ -114,14 +141,22 @@ def crawl(target):
         if len(split_path) >= 3:
             for i in range(2, len(split_path)):
                 suburl = f"{parsed_url.scheme}://{parsed_url.netloc}/{'/'.join(split_path[1:i])}"
-                new_urls.add(suburl)
-
-        def filter_url(url):
-            # ignore other domains and already found URLs
-            return urlparse(url).netloc == urlparse(target).netloc and url not in found_urls
-
-        new_urls = set(filter(filter_url, new_urls))
-        urls.update(new_urls)
-        found_urls.update(new_urls)
+                add(suburl, depth + 1)
+
+    def add(url, depth):
+        # ignore other domains and already found URLs
+        if urlparse(url).netloc == netloc and url not in found_urls:
+            found_urls.add(url)
+            if depth <= max_depth:
+                visit(url, depth)
+
+    with create_session(workers) as session, ThreadPoolExecutor(max_workers=workers) as executor:
+        visit(target, 0)
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                depth = in_flight.pop(future)
+                for url in future.result():
+                    add(url, depth + 1)
 
     return found_urls
@@ -1,4 +1,4 @@
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Optional
 from enum import Enum
 from abc import ABC, abstractmethod
 from pinaht.knowledge import knowledge_graph as kg
@@ -7,6 +7,7 @@ from pinaht.modules.module import Module
 from pinaht.flags.flag import Flag
 from pinaht.knowledge.types.knowledge import Knowledge
 import logging
+import heapq
 
 
 class State(Enum):
@@ -21,13 +22,17 @@ class NoPriorityError(Exception):
 
 
 class StrategyElement:
-    def __init__(self, name: str, module: Module):
+    def __init__(self, name: str, module: Module, index: int = 0):
         self.name = name
         self.module = module
         self.priority = 0.0
         self.meta_key = ""
         self.keyed_knowledge = {}
         self.justification = ()
+        # position in the strategy, breaks ties between equal priorities
+        self.index = index
+        # incremented on every update, invalidates older entries in the priority queue
+        self.version = 0
 
 
 class FlagElement(StrategyElement):
@@ -50,34 +55,45 @@ class Strategy(ABC):
         flags: Dict[str, Flag],
         knowledge_graph: kg.KnowledgeGraph,
         execution_graph: eg.ExecutionGraph,
+        priority_queue: bool = True,
         **kwargs,
     ):
+        """
+        :param priority_queue: if True, the strategy elements are kept in a heap, that is updated lazily for the
+                               elements with an updated dependency. Otherwise all priorities are normalized and
+                               scanned on every call of next.
+        """
         super(Strategy, self).__init__(**kwargs)
         self._logger = logging.getLogger(self.__class__.__name__)
         self.knowledge_graph = knowledge_graph
         self.execution_graph = execution_graph
-        self.strategy_elements = [StrategyElement(name, module) for name, module in modules.items()]
+        self.strategy_elements = [
+            StrategyElement(name, module, index) for index, (name, module) in enumerate(modules.items())
+        ]
         self.flags = [FlagElement(name, flag) for name, flag in flags.items()]
         self.iter = 0
         self.state = State.RUNNING
 
-    def next(self):
-        self.update(self.strategy_elements)
-
-        # normalizing and max
-        s = sum(map(lambda strategy_element: strategy_element.priority, self.strategy_elements))
-        s = 1 if s == 0 else s
+        self.priority_queue = priority_queue
+        # heap of (-priority, index, version, strategy element)
+        self.queue = []
 
-        max_strategy_element = self.strategy_elements[0]
-        for strategy_element in self.strategy_elements:
-            strategy_element.priority /= s
-            if strategy_element.priority > max_strategy_element.priority:
-                max_strategy_element = strategy_element
+    def next(self):
+        if self.priority_queue:
+            self.push(self.update(self.strategy_elements))
+            max_strategy_element = self.peek()
+        else:
+            max_strategy_element = self.max_normalized()
 
-        if max_strategy_element.priority == 0.0:
+        if max_strategy_element is None or max_strategy_element.priority == 0.0:
             self.state = State.UNSOLVED
             raise NoPriorityError()
 
+        priority = max_strategy_element.priority
+        if self.priority_queue:
+            # normalized like by max_normalized, the priorities in the heap stay unnormalized to keep their order
+            priority /= sum(map(lambda strategy_element: strategy_element.priority, self.strategy_elements))
+
         # notifies the dependency which keyed_knowledge has already been used
         max_strategy_element.module.dependency.add_executed(
             max_strategy_element.meta_key, max_strategy_element.keyed_knowledge
@@ -85,19 +101,62 @@ class Strategy(ABC):
         return (
             max_strategy_element.name,
             max_strategy_element.module,
-            max_strategy_element.priority,
+            priority,
             max_strategy_element.meta_key,
             max_strategy_element.keyed_knowledge,
             max_strategy_element.justification,
         )
 
-    def update_all(self):
+    def max_normalized(self) -> StrategyElement:
         self.update(self.strategy_elements)
+
+        # normalizing and max
+        s = sum(map(lambda strategy_element: strategy_element.priority, self.strategy_elements))
+        s = 1 if s == 0 else s
+
+        max_strategy_element = self.strategy_elements[0]
+        for strategy_element in self.strategy_elements:
+            strategy_element.priority /= s
+            if strategy_element.priority > max_strategy_element.priority:
+                max_strategy_element = strategy_element
+
+        return max_strategy_element
+
+    def push(self, element_list: List[StrategyElement]):
+        for strategy_element in element_list:
+            if strategy_element.priority > 0.0:
+                heapq.heappush(
+                    self.queue,
+                    (-strategy_element.priority, strategy_element.index, strategy_element.version, strategy_element),
+                )
+
+    def peek(self) -> Optional[StrategyElement]:
+        """
+        :return: the strategy element with the highest priority (the first on equal priorities) or None
+        """
+        while self.queue:
+            priority, index, version, strategy_element = self.queue[0]
+            if version == strategy_element.version:
+                return strategy_element
+            # the strategy element has been updated since
+            heapq.heappop(self.queue)
+        return None
+
+    def update_all(self):
+        self.push(self.update(self.strategy_elements))
         self.update(self.flags)
 
-    def update(self, element_list: List[StrategyElement]):
+    def update(self, element_list: List[StrategyElement]) -> List[StrategyElement]:
+        """
+        update recalculates the priority of the strategy elements with an updated dependency.
+
+        :return: the updated strategy elements
+        """
+        updated_elements = []
         for strategy_element in element_list:
             if strategy_element.module.dependency.updated:
+                strategy_element.version += 1
+                updated_elements.append(strategy_element)
                 satisfying_knowledge = strategy_element.module.dependency.resolve()
                 try:
                     meta_key, keyed_knowledge_node, priority = self.calc_priority(satisfying_knowledge)
@@ -128,6 +187,8 @@ class Strategy(ABC):
                     strategy_element.meta_key = ""
                     strategy_element.module.dependency.updated = False
 
+        return updated_elements
+
     def finished(self, max_iter: int = 10 ** 5) -> bool:
         if self.iter > max_iter:
             self._logger.info(f"Strategy finished because the max iterations of {max_iter} have been reached.")
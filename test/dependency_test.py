@@ -158,3 +158,157 @@ def test():
     logger.debug(dependency.fullfilled_knowledge)
 
     logger.debug(dependency.resolve())
+
+
+class Node(Knowledge):
+    def __init__(self, **kwargs):
+        super(Node, self).__init__(**kwargs)
+        self.children = []
+        self.lookup = {"children": self.children}
+
+    def fuzzy_eq(self, other) -> float:
+        return 1.0 if id(self) == id(other) else 0.0
+
+    def add_child(self, key, child):
+        self.lookup[key].append(child)
+        child.parent = self
+
+
+class Leaf(Node):
+    pass
+
+
+def gen_dependency(incremental: bool) -> Dependency:
+    from pinaht.knowledge.precondition_factory.preconditions import check_type
+    from pinaht.knowledge.precondition_factory.metapreconditions import is_parent
+
+    dnf = {
+        "M": (
+            {"node": check_type(Node), "leaf_1": check_type(Leaf), "leaf_2": check_type(Leaf)},
+            is_parent("node", ["leaf_1", "leaf_2"]),
+        )
+    }
+    return Dependency(dnf, incremental)
+
+
+def grouping_ids(groupings):
+    # resolve_all returns a grouping once for every time its knowledge has been fullfilled
+    return sorted(
+        {
+            (meta_key, certainty, tuple(id(knowledge) for key, (c, knowledge) in sorted(key_grouping.items())))
+            for meta_key, certainty, key_grouping in groupings
+        }
+    )
+
+
+def test_incremental_resolve():
+    incremental = gen_dependency(True)
+    full = gen_dependency(False)
+
+    def add(parent, knowledge):
+        if parent is not None:
+            parent.add_child("children", knowledge)
+        incremental.update(knowledge)
+        full.update(knowledge)
+
+    nodes = [Node() for i in range(3)]
+    for node in nodes:
+        add(None, node)
+        for i in range(2):
+            add(node, Leaf())
+        assert grouping_ids(incremental.resolve()) == grouping_ids(full.resolve())
+
+    add(nodes[0], Leaf())
+    result = incremental.resolve()
+    assert grouping_ids(result) == grouping_ids(full.resolve())
+    # pairs of children for every node, is_parent also accepts a leaf as its own parent
+    assert len(result) == 9 + 4 + 4 + 7
+
+    meta_key, certainty, key_grouping = result[0]
+    executed = {key: knowledge for key, (c, knowledge) in key_grouping.items()}
+    incremental.add_executed(meta_key, executed)
+    full.add_executed(meta_key, executed)
+    assert grouping_ids(incremental.resolve()) == grouping_ids(full.resolve())
+    assert len(incremental.resolve()) == len(result) - 1
+    assert incremental.has_been_executed(meta_key, executed) and full.has_been_executed(meta_key, executed)
+
+
+def test_structural_resolve():
+    from pinaht.knowledge.precondition_factory.preconditions import check_type
+    from pinaht.knowledge.precondition_factory.metapreconditions import is_parent, merge
+
+    class Service(Node):
+        pass
+
+    dnf = {
+        "M": (
+            {"node": check_type(Node), "service": check_type(Service), "leaf": check_type(Leaf)},
+            merge([is_parent("node", ["service"]), is_parent("service", ["leaf"])]),
+        ),
+        "U": ({"service": check_type(Service), "other": check_type(Leaf)}, is_parent("service", ["service"])),
+    }
+    assert sorted(dnf["M"][1].structure()) == [("node", {"service"}, 1), ("service", {"leaf"}, 1)]
+
+    incremental = Dependency(dnf)
+    full = Dependency(dnf, False)
+
+    def add(parent, knowledge):
+        if parent is not None:
+            parent.add_child("children", knowledge)
+        incremental.update(knowledge)
+        full.update(knowledge)
+        return knowledge
+
+    shared = Leaf()
+    for i in range(3):
+        node = add(None, Node())
+        for j in range(2):
+            service = add(node, Service())
+            add(service, Leaf())
+            # the same knowledge below a new parent, as it happens for enum values
+            add(service, shared)
+            assert grouping_ids(incremental.resolve()) == grouping_ids(full.resolve())
+
+
+def test_updated_resolve():
+    from pinaht.knowledge.precondition_factory.metapreconditions import check_empty_child, is_parent, merge
+
+    class Usable(Precondition):
+        def holds(self, knowledge: Knowledge) -> float:
+            return 1.0 if isinstance(knowledge, Leaf) and knowledge.usable else 0.0
+
+        def doc(self) -> str:
+            return "usable"
+
+    incremental = gen_dependency(True)
+    full = gen_dependency(False)
+    for dependency in (incremental, full):
+        dependency.preconditions["leaf_1"] = Usable()
+        dependency.precondition_dnf["M"][0]["leaf_1"] = dependency.preconditions["leaf_1"]
+
+    node = Node()
+    leaves = [Leaf() for i in range(2)]
+    for dependency in (incremental, full):
+        dependency.update(node)
+    for leaf in leaves:
+        leaf.usable = True
+        node.add_child("children", leaf)
+        for dependency in (incremental, full):
+            dependency.update(leaf)
+    # is_parent also accepts a leaf as its own parent
+    assert len(incremental.resolve()) == 4 + 1 + 1
+    assert grouping_ids(incremental.resolve()) == grouping_ids(full.resolve())
+
+    # the groupings of an updated knowledge are checked again
+    for usable in (False, True):
+        leaves[0].usable = usable
+        for dependency in (incremental, full):
+            dependency.update(leaves[0], only_update=True)
+        result = incremental.resolve()
+        assert len(result) == (6 if usable else 3)
+        assert grouping_ids(result) == grouping_ids(full.resolve())
+
+    # metapreconditions, that are not monotonic, are checked again by every resolve
+    meta = merge([is_parent("node", ["leaf_1", "leaf_2"]), check_empty_child("node", "children")])
+    assert not meta.monotonic()
+    assert not Dependency({"M": (incremental.precondition_dnf["M"][0], meta)}).incremental
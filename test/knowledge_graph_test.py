@@ -0,0 +1,128 @@
+from pinaht.knowledge.knowledge_graph import KnowledgeGraph
+from pinaht.knowledge.precondition_factory.preconditions import check_type, compare_value
+from pinaht.knowledge.precondition_factory.metapreconditions import is_parent, static, identical_ancestors
+from pinaht.knowledge.types.network import Network
+from pinaht.knowledge.types.target import Target
+from pinaht.knowledge.types.ipaddress import IPAddress
+from pinaht.knowledge.types.status import Status
+from pinaht.knowledge.types.service import Service
+from pinaht.knowledge.types.port import Port
+from pinaht.knowledge.types.name import Name
+from pinaht.knowledge.types.knowledge import Knowledge
+
+
+def test_flatten():
+    knowledge_graph = KnowledgeGraph()
+    network = Network()
+    knowledge_graph.add_knowledge(None, "network", network)
+
+    targets = []
+    for i in range(5):
+        # the address is a child of the target, before the target is added
+        target = Target(address=IPAddress(i))
+        knowledge_graph.add_knowledge(network, "targets", target)
+        knowledge_graph.add_knowledge(target, "status", Status.UP)
+        targets.append(target)
+
+    flattened = knowledge_graph.flatten()
+    traversed = knowledge_graph.bfs(knowledge_graph.root)
+
+    assert len(flattened) == len({id(knowledge) for knowledge in flattened})
+    assert {id(knowledge) for knowledge in flattened} == {id(knowledge) for knowledge in traversed}
+    assert [knowledge for knowledge in flattened if isinstance(knowledge, IPAddress)] == [
+        target.address[0] for target in targets
+    ]
+
+    grouping = knowledge_graph.query(
+        ({"target": check_type(Target), "ip": check_type(IPAddress)}, is_parent("target", ["ip"]))
+    )
+    assert grouping["ip"] is grouping["target"].address[0]
+
+
+def test_indexes():
+    knowledge_graph = KnowledgeGraph()
+    network = Network()
+    knowledge_graph.add_knowledge(None, "network", network)
+
+    services = []
+    for i, name in enumerate(["OpenSSH", "Apache httpd", "OpenSSH"]):
+        target = Target(address=IPAddress(i))
+        service = Service(port=Port(22 + i), service_name=Name(name))
+        knowledge_graph.add_knowledge(network, "targets", target)
+        knowledge_graph.add_knowledge(target, "services", service)
+        knowledge_graph.add_knowledge(target, "status", Status.UP)
+        services.append(service)
+
+    assert knowledge_graph.instances(Service) == services
+    assert len(knowledge_graph.instances(Knowledge)) == len(knowledge_graph.flatten())
+    assert knowledge_graph.find(Port, 23) == services[1].port
+    assert knowledge_graph.find(IPAddress, IPAddress(2)) == knowledge_graph.instances(Target)[2].address
+    # the enum knowledge is a child of every target
+    assert [parent for parent, key in knowledge_graph.parents(Status.UP)] == knowledge_graph.instances(Target)
+
+    openssh_services = [
+        parent
+        for value, names in knowledge_graph.values(Name).items()
+        if "openssh" in value.lower()
+        for name in names
+        for parent, key in knowledge_graph.parents(name)
+        if key == "service_name"
+    ]
+    assert openssh_services == [services[0], services[2]]
+
+
+def test_query_top():
+    import random
+
+    random.seed(0)
+    knowledge_graph = KnowledgeGraph()
+    ports = [Port(i) for i in range(12)]
+    for port in ports:
+        knowledge_graph.add_knowledge(None, "ports", port)
+
+    def certainty():
+        certainties = {int(port): random.choice([0.0, 0.2, 0.5, 0.7, 0.7, 1.0]) for port in ports}
+        return compare_value(lambda k: certainties.get(k, 0.0) if isinstance(k, Port) else 0.0)
+
+    q = ({"a": certainty(), "b": certainty(), "c": certainty()}, static(["a", "b", "c"], 0.9))
+
+    # every grouping, best first and of equal groupings the first ones
+    groupings = list(knowledge_graph.query_iter(q))
+    expected = sorted(enumerate(groupings), key=lambda g: (-g[1][0], g[0]))
+    for k in [1, 5, 20]:
+        assert [grouping for score, grouping in knowledge_graph.query_top(q, k)] == [
+            grouping for position, (score, grouping) in expected[:k]
+        ]
+
+    assert knowledge_graph.query(q) == expected[0][1][1]
+    assert len(list(knowledge_graph.query_iter(q, limit=3))) == 3
+    assert knowledge_graph.query(({"a": check_type(Target)}, static(["a"]))) is None
+
+
+def test_identical_ancestors():
+    knowledge_graph = KnowledgeGraph()
+    network = Network()
+    knowledge_graph.add_knowledge(None, "network", network)
+    target = Target(address=IPAddress(1))
+    service = Service(port=Port(22), service_name=Name("OpenSSH"))
+    knowledge_graph.add_knowledge(network, "targets", target)
+    knowledge_graph.add_knowledge(target, "services", service)
+
+    precondition = identical_ancestors(["a", "b"])
+    assert precondition.holds(a=service.port[0], b=service.service_name[0]) == 0.75
+    assert precondition.holds(a=service.port[0], b=target.address[0]) == 0.625
+
+    # the cached ancestor paths are invalidated, if the knowledge is moved
+    other = Target()
+    knowledge_graph.add_knowledge(network, "targets", other)
+    assert precondition.holds(a=service.port[0], b=other) == 0.5
+    service.parent = other
+    assert service.port[0].ancestor_ids()[-3] == id(other)
+    assert precondition.holds(a=service.port[0], b=other) == 0.75
+
+    # a leaf shared by many targets, like an enum member, does not invalidate the other paths
+    generation = Knowledge.generation
+    for parent in [target, other, target]:
+        parent.append_child("status", Status.UP)
+        assert Status.UP.ancestor_ids() == parent.ancestor_ids() + (id(Status.UP),)
+    assert Knowledge.generation == generation
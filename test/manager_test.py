@@ -0,0 +1,274 @@
+from pinaht.knowledge.knowledge_graph import KnowledgeGraph
+from pinaht.knowledge.execution_graph import ExecutionGraph
+from pinaht.knowledge.manager import Manager, BufferedModuleManager
+from pinaht.knowledge.dependency import Dependency
+from pinaht.knowledge.precondition import precondition_cache
+from pinaht.knowledge.precondition_factory.preconditions import check_type, check_str, compare_value
+from pinaht.knowledge.precondition_factory.metapreconditions import is_parent, static
+from pinaht.knowledge.types.target import Target
+from pinaht.knowledge.types.ipaddress import IPAddress
+from pinaht.knowledge.types.name import Name
+from pinaht.knowledge.types.service import Service
+from pinaht.knowledge.types.port import Port
+from pinaht.knowledge.types.status import Status
+from pinaht.knowledge.types.credentials import Credentials
+from pinaht.knowledge.types.password import Password
+from pinaht.knowledge.duality_edge import DualityEdgeType
+
+
+def test_type_dispatch():
+    manager = Manager(KnowledgeGraph(), ExecutionGraph())
+    calls = []
+
+    def any_knowledge(knowledge):
+        calls.append(knowledge)
+        return 0.0
+
+    dependency = Dependency(
+        {
+            "meta": (
+                {
+                    "target": check_type(Target),
+                    "ip": check_type(IPAddress),
+                    "name": check_str(lambda value: 1.0),
+                    "any": compare_value(any_knowledge),
+                },
+                is_parent("target", ["ip", "name"]),
+            )
+        }
+    )
+    manager.register(dependency)
+
+    assert manager.dispatch(Target) == {dependency: ["target", "any"]}
+    assert manager.dispatch(Name) == {dependency: ["name", "any"]}
+
+    target = Target()
+    ip = IPAddress(1)
+    manager.add_knowledge(None, "targets", target)
+    manager.notify(target)
+    manager.add_knowledge(target, "address", ip)
+    manager.notify(ip)
+
+    assert calls == [target, ip]
+    assert [knowledge for certainty, knowledge in dependency.fullfilled_knowledge["target"]] == [target]
+    assert [knowledge for certainty, knowledge in dependency.fullfilled_knowledge["ip"]] == [ip]
+    assert dependency.fullfilled_knowledge["name"] == []
+
+    manager.remove(dependency)
+    assert manager.dispatch(Target) == {}
+
+
+def test_flush():
+    execution_graph = ExecutionGraph()
+    manager = Manager(KnowledgeGraph(), execution_graph)
+    dependency = Dependency({"meta": ({"name": check_type(Name)}, static(["name"]))})
+    manager.register(dependency)
+
+    target = Target()
+    manager.add_knowledge(None, "targets", target)
+    manager.notify(target)
+
+    buffered_module_manager = BufferedModuleManager("module", 0.0)
+    buffered_module_manager.flush_handler = lambda flushed: manager.add_module(flushed, justification)
+    justification = ("meta", static(["target"]), {"target": (check_type(Target), execution_graph.root, target)})
+
+    first, second = Name("a"), Name("b")
+    buffered_module_manager.add_knowledge(target, "hostname", first, 1.0)
+    buffered_module_manager.flush()
+
+    # the flushed knowledge is already known, while the module is still running
+    assert target.hostname == [first]
+    assert [knowledge for certainty, knowledge in dependency.fullfilled_knowledge["name"]] == [first]
+    assert buffered_module_manager.add_knowledge_buffer == []
+
+    buffered_module_manager.add_knowledge(target, "hostname", second, 1.0)
+    manager.add_module(buffered_module_manager, justification)
+
+    assert target.hostname == [first, second]
+    assert [knowledge for certainty, knowledge in dependency.fullfilled_knowledge["name"]] == [first, second]
+    # the node of the module is only added once
+    assert [edge.target for edge in execution_graph.root.next] == [buffered_module_manager.node]
+
+
+def test_buffered_executed():
+    execution_graph = ExecutionGraph()
+    manager = Manager(KnowledgeGraph(), execution_graph)
+    dependency = Dependency({"meta": ({"ip": check_type(IPAddress)}, static(["ip"]))})
+    manager.register(dependency)
+
+    first, second = IPAddress(1), IPAddress(2)
+    buffered_module_manager = BufferedModuleManager("module", 0.0)
+    buffered_module_manager.add_knowledge(None, "address", first, 1.0)
+    buffered_module_manager.add_knowledge(None, "address", second, 1.0)
+    # the module has already done the work for the first address
+    buffered_module_manager.add_executed(dependency, "meta", {"ip": first})
+    manager.add_module(buffered_module_manager, ("meta", static([]), {}))
+
+    assert [grouping["ip"][1] for meta_key, certainty, grouping in dependency.resolve()] == [second]
+
+
+def test_add_knowledge_batch():
+    execution_graph = ExecutionGraph()
+    manager = Manager(KnowledgeGraph(), execution_graph)
+    dependency = Dependency({"meta": ({"port": check_type(Port), "name": check_type(Name)}, static(["port"]))})
+    manager.register(dependency)
+
+    batches = []
+    update_batch = dependency.update_batch
+    dependency.update_batch = lambda batch, only_update=False: (batches.append(batch), update_batch(batch))
+
+    target = Target(hostname=Name("host"))
+    for i in range(2000):
+        target.add_child("services", Service(port=Port(i), service_name=Name("ssh")))
+
+    buffered_module_manager = BufferedModuleManager("nmap", 0.0)
+    buffered_module_manager.add_knowledge(None, "targets", target, 0.9, True)
+    manager.add_module(buffered_module_manager, ("meta", static([]), {}))
+
+    # the target, its name and every service with its port and name
+    assert len(buffered_module_manager.node.duality_edges) == 2 + 3 * 2000
+    assert all(len(port.duality_edges) == 1 for port in manager.knowledge_graph.instances(Port))
+    # a single batch with the ports and names
+    assert len(batches) == 1 and len(batches[0]) == 1 + 2 * 2000
+    assert len(dependency.fullfilled_knowledge["port"]) == 2000
+    assert len(dependency.fullfilled_knowledge["name"]) == 2001
+
+
+def test_merge_singletons():
+    manager = Manager(KnowledgeGraph(), ExecutionGraph())
+    target = Target()
+    manager.add_knowledge(None, "targets", target)
+
+    # two modules, that ran at the same time, both found no credentials of the target
+    first, second = BufferedModuleManager("userdir", 0.0), BufferedModuleManager("extract", 0.0)
+    for buffered_module_manager, name in [(first, "alice"), (second, "bob")]:
+        credentials = Credentials()
+        buffered_module_manager.add_knowledge(target, "credentials", credentials, 1.0)
+        buffered_module_manager.add_knowledge(credentials, "users", Name(name), 1.0)
+        buffered_module_manager.add_knowledge(target, "status", Status.UP, 1.0)
+        manager.add_module(buffered_module_manager, ("meta", static([]), {}))
+
+    # the knowledge added later to the merged credentials goes to the existing ones
+    second.add_knowledge(credentials, "passwords", Password("secret"), 1.0)
+    second.add_knowledge(target, "status", Status.DOWN, 1.0)
+    manager.add_module(second, ("meta", static([]), {}))
+
+    assert len(target.credentials) == 1
+    assert target.credentials[0].users == ["alice", "bob"]
+    assert target.credentials[0].passwords == ["secret"]
+    assert manager.knowledge_graph.instances(Credentials) == target.credentials
+    # a later merge replaces the status
+    assert target.status == [Status.DOWN]
+    assert manager.knowledge_graph.parents(Status.UP) == []
+
+    # a conflicting status of the same batch is dropped
+    third = BufferedModuleManager("nmap", 0.0)
+    third.add_knowledge(target, "status", Status.UNKNOWN, 1.0)
+    third.add_knowledge(target, "status", Status.UP, 1.0)
+    manager.add_module(third, ("meta", static([]), {}))
+    assert target.status == [Status.UNKNOWN]
+
+
+def test_replace_singleton_events():
+    manager = Manager(KnowledgeGraph(), ExecutionGraph())
+    dependency = Dependency(
+        {"meta": ({"target": check_type(Target), "status": check_type(Status)}, is_parent("target", ["status"]))}
+    )
+    manager.register(dependency)
+
+    events = []
+    notify = dependency.notify
+    dependency.notify = lambda observable, event: (events.append(event), notify(observable, event))
+
+    target = Target()
+    manager.add_knowledge(None, "targets", target)
+    manager.notify(target)
+    for status in [Status.UP, Status.DOWN]:
+        buffered_module_manager = BufferedModuleManager("nmap", 0.0)
+        buffered_module_manager.add_knowledge(target, "status", status, 1.0)
+        manager.add_module(buffered_module_manager, ("meta", static([]), {}))
+
+    # the new status is added, the target is updated
+    assert [(event.knowledge, event.only_update) for event in events[-2:]] == [
+        ([Status.DOWN], False),
+        ([target], True),
+    ]
+    result = dependency.resolve()
+    assert [key_grouping["status"][1] for meta_key, certainty, key_grouping in result] == [Status.DOWN]
+
+
+def test_deferred_events():
+    execution_graph = ExecutionGraph()
+    manager = Manager(KnowledgeGraph(), execution_graph)
+    dependency = Dependency({"meta": ({"name": check_type(Name)}, static(["name"]))})
+    manager.register(dependency)
+
+    events = []
+    notify = dependency.notify
+    dependency.notify = lambda observable, event: (events.append(event), notify(observable, event))
+
+    target = Target()
+    manager.add_knowledge(None, "targets", target)
+    justification = ("meta", static(["target"]), {"target": (check_type(Target), execution_graph.root, target)})
+
+    buffered_module_manager = BufferedModuleManager("module", 0.0, deferred=True)
+    buffered_module_manager.flush_handler = lambda flushed: manager.add_module(flushed, justification, False)
+    names = [Name(str(i)) for i in range(3)]
+    for name in names:
+        buffered_module_manager.add_knowledge(target, "hostname", name, 1.0)
+        buffered_module_manager.flush()
+
+    # the flushed knowledge is in the graph, but the dependency is notified at the end
+    assert target.hostname == names
+    assert events == [] and dependency.fullfilled_knowledge["name"] == []
+
+    buffered_module_manager.update_knowledge(names[0], 0.5)
+    manager.add_module(buffered_module_manager, justification)
+    assert [(event.knowledge, event.only_update) for event in events] == [(names, False), ([names[0]], True)]
+    # the update fullfills the updated knowledge again, but does not add it
+    assert [knowledge for position, certainty, knowledge in dependency.fullfilled_index["name"].values()] == names
+
+    # nested contexts send the events at the end of the outermost
+    with manager.deferred():
+        with manager.deferred():
+            manager.notify(Name("a"))
+        manager.notify(Name("b"))
+        assert len(events) == 2
+    assert len(events) == 3 and events[-1].knowledge == ["a", "b"]
+
+
+def test_precondition_cache():
+    precondition_cache.clear()
+    execution_graph = ExecutionGraph()
+    manager = Manager(KnowledgeGraph(), execution_graph)
+    calls = []
+
+    def expensive(knowledge):
+        if not isinstance(knowledge, Name):
+            return 0.0
+        calls.append(knowledge)
+        return 1.0 if "ssh" in knowledge else 0.5
+
+    precondition = compare_value(expensive, cached=True)
+    name = Name("openssh")
+    manager.add_knowledge(None, "names", name)
+
+    assert precondition.certainty(name) == 1.0
+    assert manager.knowledge_graph.query(({"name": precondition}, static(["name"])))["name"] is name
+    assert precondition.holds_batch([name, name]) == [1.0, 1.0]
+    assert calls == [name]
+
+    # an update invalidates the cached certainties of the knowledge
+    manager.draw_duality_edge(name, execution_graph.root, 1.0, DualityEdgeType.UPDATE)
+    assert precondition.certainty(name) == 1.0
+    assert calls == [name, name]
+
+    uncached = compare_value(expensive)
+    uncached.certainty(name)
+    uncached.certainty(name)
+    assert len(calls) == 4
+
+    # the cache keeps the knowledge alive, until it is cleared
+    assert precondition_cache.entries[id(name)][0] is name
+    precondition_cache.clear()
+    assert precondition_cache.entries == {}
@@ -0,0 +1,49 @@
+from pinaht.knowledge.types.processshell import ProcessShell
+from pinaht.knowledge.types.socketshell import SocketShell
+import socket
+import subprocess
+
+
+def test_execute_stream():
+    shell = ProcessShell("bash")
+
+    assert shell.execute("echo a; echo b") == ["a", "b"]
+    assert shell.execute("true") == []
+    # the output does not need to end with a newline
+    assert shell.execute("printf 'a\\nb'") == ["a", "b"]
+
+    lines = shell.execute_stream("seq 100000")
+    assert next(lines) == "1"
+    assert sum(1 for line in lines) == 99999
+
+    # too long lines are yielded in parts
+    parts = list(
+        shell.execute_stream("yes x 2>/dev/null | head -n 100000 | tr -d '\\n'; echo; echo y", max_buffer_size=4096)
+    )
+    assert len(parts) > 2
+    assert "".join(parts[:-1]) == "x" * 100000
+    assert parts[-1] == "y"
+
+    # the rest of a stopped iteration does not affect the following commands
+    for line in shell.execute_stream("seq 100000"):
+        if line == "10":
+            break
+    assert shell.execute("echo done") == ["done"]
+
+
+def test_socket_shell():
+    local, remote = socket.socketpair()
+    process = subprocess.Popen(["sh"], stdin=remote, stdout=remote, stderr=subprocess.STDOUT)
+    remote.close()
+    shell = SocketShell(local)
+    shell.BUFFER_SIZE = 1024
+
+    assert shell.check()
+    assert shell.execute("echo a; echo b") == ["a", "b"]
+    # longer outputs and lines than the buffer are received completely
+    assert shell.execute("seq 100000") == [str(i) for i in range(1, 100001)]
+    assert shell.execute("yes x 2>/dev/null | head -n 5000 | tr -d '\\n'") == ["x" * 5000]
+    assert shell.execute("echo done") == ["done"]
+
+    local.close()
+    process.wait()
@@ -0,0 +1,79 @@
+import threading
+import paramiko
+import pytest
+
+from pinaht.knowledge.types import ssh_pool
+
+
+class FakeTransport:
+    passwords = {"root": "toor", "admin": "admin"}
+    max_auth_tries = 3
+    connections = 0
+
+    def __init__(self, address):
+        self.active = True
+        self.failures = 0
+        FakeTransport.connections += 1
+
+    def start_client(self):
+        pass
+
+    def set_keepalive(self, interval):
+        pass
+
+    def auth_password(self, username, password):
+        if not self.active:
+            raise paramiko.SSHException("No existing session")
+        if self.passwords.get(username) != password:
+            self.failures += 1
+            if self.failures == self.max_auth_tries:
+                self.active = False
+            raise paramiko.AuthenticationException()
+
+    def is_active(self):
+        return self.active
+
+    def close(self):
+        self.active = False
+
+
+def test_pool(monkeypatch):
+    monkeypatch.setattr(ssh_pool.paramiko, "Transport", FakeTransport)
+    FakeTransport.connections = 0
+    pool = ssh_pool.SSHConnectionPool()
+
+    transport = pool.connect("10.0.0.1", 22, "root", "toor")
+    assert pool.connect("10.0.0.1", 22, "root", "toor") is transport
+    assert FakeTransport.connections == 1
+
+    # a wrong password must not be accepted because of the pooled transport
+    with pytest.raises(paramiko.AuthenticationException):
+        pool.connect("10.0.0.1", 22, "root", "")
+    assert pool.connect("10.0.0.1", 22, "root", "toor") is transport
+
+    # other hosts and closed transports are connected again
+    assert pool.connect("10.0.0.2", 22, "root", "toor") is not transport
+    transport.close()
+    assert pool.connect("10.0.0.1", 22, "root", "toor") is not transport
+    assert FakeTransport.connections == 4
+
+    pool.close()
+    assert pool.transports == {}
+
+
+def test_authenticate(monkeypatch):
+    monkeypatch.setattr(ssh_pool.paramiko, "Transport", FakeTransport)
+    FakeTransport.connections = 0
+    pool = ssh_pool.SSHConnectionPool()
+
+    # the server closes the transport after three failures, the fourth password is tried on a new one
+    passwords = ["123456", "password", "qwerty", "letmein", "toor", "root"]
+    assert pool.authenticate("10.0.0.1", 22, "root", passwords) == "toor"
+    assert FakeTransport.connections == 2
+    assert pool.connect("10.0.0.1", 22, "root", "toor") is pool.transports[("10.0.0.1", 22, "root")][0]
+    assert FakeTransport.connections == 2
+
+    assert pool.authenticate("10.0.0.1", 22, "admin", ["123456"]) is None
+    stop = threading.Event()
+    stop.set()
+    assert pool.authenticate("10.0.0.1", 22, "admin", ["admin"], stop) is None
@@ -0,0 +1,71 @@
+from pinaht.knowledge.knowledge_graph import KnowledgeGraph
+from pinaht.knowledge.execution_graph import ExecutionGraph
+from pinaht.knowledge.manager import Manager, BufferedModuleManager
+from pinaht.knowledge.duality_edge import DualityEdgeType
+from pinaht.knowledge.types.target import Target
+from pinaht.knowledge.types.ipaddress import IPAddress
+from pinaht.knowledge.types.service import Service
+from pinaht.knowledge.types.port import Port
+from pinaht.knowledge.types.name import Name
+from pinaht.knowledge.types.credentials import Credentials
+from pinaht.knowledge.types.password import Password
+from pinaht.modules import ssh_to_shell
+from pinaht.modules.ssh_to_shell import SSHToShell
+from pinaht.strategies.fast_strategy import FastStrategy
+
+
+def test_spray(monkeypatch):
+    tried = []
+    shells = []
+
+    def authenticate(host, port, user, passwords, stop=None):
+        tried.append((user, list(passwords)))
+        return "toor" if user == "root" and "toor" in passwords else None
+
+    monkeypatch.setattr(ssh_to_shell.ssh_pool, "authenticate", authenticate)
+    monkeypatch.setattr(
+        SSHToShell,
+        "add_shell",
+        lambda self, manager, target, user, password, ip, port: shells.append((user, password)),
+    )
+
+    manager = Manager(KnowledgeGraph(), ExecutionGraph())
+    module = SSHToShell(manager)
+    strategy = FastStrategy({"SSHToShell": module}, {}, manager.knowledge_graph, manager.execution_graph)
+
+    target = Target()
+    service = Service()
+    credentials = Credentials()
+    start_knowledge = [
+        (None, "targets", target),
+        (target, "address", IPAddress(IPAddress.str_to_ip("10.0.0.1"))),
+        (target, "services", service),
+        (service, "port", Port(22)),
+        (service, "service_name", Name("OpenSSH")),
+        (target, "credentials", credentials),
+        (credentials, "users", Name("root")),
+        (credentials, "passwords", Password("toor")),
+    ]
+    for parent, key, knowledge in start_knowledge:
+        manager.add_knowledge(parent, key, knowledge)
+        manager.draw_duality_edge(knowledge, manager.execution_graph.root, 0.99, DualityEdgeType.ADD)
+        manager.notify(knowledge)
+
+    # the only pair is chosen by the strategy, which marks it as executed before the spray
+    name, module, priority, meta_key, keyed_knowledge, justification = strategy.next()
+    assert meta_key == "credentials_ssh"
+    buffered_module_manager = BufferedModuleManager(name, 0.0)
+    module.execute(buffered_module_manager, meta_key, keyed_knowledge)
+    manager.add_module(buffered_module_manager, justification)
+
+    assert tried == [("root", ["toor"])]
+    assert shells == [("root", "toor")]
+
+    # a later spray only tries the new pairs
+    password = Password("123456")
+    manager.add_knowledge(credentials, "passwords", password)
+    manager.draw_duality_edge(password, manager.execution_graph.root, 0.99, DualityEdgeType.ADD)
+    manager.notify(password)
+    name, module, priority, meta_key, keyed_knowledge, justification = strategy.next()
+    module.execute(BufferedModuleManager(name, 0.0), meta_key, keyed_knowledge)
+    assert tried == [("root", ["toor"]), ("root", ["123456"])]
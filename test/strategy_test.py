@@ -269,3 +269,64 @@ def test():
     print(i_1.lookup)
     app = Application(FastStrategy, [(None, "init", a)], modules)
     app.start()
+
+
+class ValueModule(Module):
+    scale = 1.0
+
+    def _generate_precondition_dnf(self) -> Dict[str, Tuple[Dict[str, Precondition], MetaPrecondition]]:
+        from pinaht.knowledge.precondition_factory.preconditions import compare_value
+        from pinaht.knowledge.precondition_factory.metapreconditions import static
+
+        value = compare_value(lambda k: self.scale * k / 100 if isinstance(k, Integer) else 0.0)
+        return {"value": ({"value": value}, static(["value"]))}
+
+    def execute(
+        self, buffered_module_manager: BufferedModuleManager, meta_key: str, keyed_knowledge: Dict[str, Knowledge]
+    ):
+        pass
+
+
+class HalfValueModule(ValueModule):
+    scale = 0.5
+
+
+def test_priority_queue():
+    from pinaht.knowledge.knowledge_graph import KnowledgeGraph
+    from pinaht.knowledge.execution_graph import ExecutionGraph
+    from pinaht.knowledge.manager import Manager
+    from pinaht.knowledge.duality_edge import DualityEdgeType
+    from pinaht.strategies.strategy import NoPriorityError
+
+    values = [Integer(value) for value in [20, 80, 40, 80, 10]]
+
+    def run(priority_queue: bool):
+        manager = Manager(KnowledgeGraph(), ExecutionGraph())
+        modules = {"ValueModule": ValueModule(manager), "HalfValueModule": HalfValueModule(manager)}
+        strategy = FastStrategy(
+            modules, {}, manager.knowledge_graph, manager.execution_graph, priority_queue=priority_queue
+        )
+        order = []
+        priorities = []
+        for i, value in enumerate(values):
+            manager.draw_duality_edge(value, manager.execution_graph.root, 1.0, DualityEdgeType.ADD)
+            manager.notify(value)
+            if i % 2 == 1:
+                name, module, priority, meta_key, keyed_knowledge, justification = strategy.next()
+                order.append((name, id(keyed_knowledge["value"])))
+                priorities.append(priority)
+        while True:
+            try:
+                name, module, priority, meta_key, keyed_knowledge, justification = strategy.next()
+            except NoPriorityError:
+                return order, priorities
+            order.append((name, id(keyed_knowledge["value"])))
+            priorities.append(priority)
+
+    order, priorities = run(True)
+    normalized_order, normalized_priorities = run(False)
+    assert order == normalized_order
+    assert len(order) == 2 * len(values)
+    # the priorities are normalized on both paths
+    assert priorities[0] == normalized_priorities[0] < 1.0
+    assert all(0.0 < priority <= 1.0 for priority in priorities)
@@ -0,0 +1,55 @@
+import pytest
+from pinaht.knowledge.types.target import Target
+from pinaht.knowledge.types.service import Service
+from pinaht.knowledge.types.ipaddress import IPAddress
+from pinaht.knowledge.types.port import Port
+from pinaht.knowledge.types.name import Name
+from pinaht.knowledge.types.status import Status
+from pinaht.knowledge.types.version import Version
+from pinaht.knowledge.types.knowledge import EMPTY_LOOKUP, SINGLETON
+
+
+def test_slots():
+    target = Target()
+    name = Name("OpenSSH")
+    assert not hasattr(target, "__dict__")
+    assert not hasattr(name, "__dict__")
+    assert target.type == "BRANCH" and name.type == "LEAF_EXTENDS" and Status.UP.type == "LEAF_ENUM"
+
+    # the children are allocated with the first child
+    assert target.lookup is EMPTY_LOOKUP
+    assert target.services == [] and target.address == []
+
+    service = Service(port=Port(22), service_name=name)
+    target.add_child("services", service)
+    target.add_child("address", IPAddress(1))
+    assert target.services == [service] and service.parent is target
+    assert name.parent is service
+    assert list(target.lookup) == ["services", "address"]
+    assert target.hostname == []
+
+
+def test_schema():
+    target = Target(address=IPAddress(1), hostname=[Name("a"), Name("b")])
+    assert target.schema["address"] == (IPAddress, SINGLETON)
+    assert target.hostname == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        target.add_child("address", IPAddress(2))
+    with pytest.raises(ValueError):
+        target.add_child("port", Port(22))
+    with pytest.raises(TypeError):
+        target.add_child("services", Port(22))
+    with pytest.raises(ValueError):
+        Port(22).add_child("port", Port(22))
+    assert target.address == [1]
+
+    # a SINGLETON child is replaced, e.g. by a more accurate version
+    service = Service(port=Port(22))
+    version = Version(Version.parse_version("7.4"))
+    service.add_child("service_version", version)
+    with pytest.raises(ValueError):
+        service.add_child("service_version", Version(Version.parse_version("4.9")))
+    assert service.replace_child("service_version", Version(Version.parse_version("4.9"))) is version
+    assert [str(version) for version in service.service_version] == ["4.9"]
+    assert version.parent is None and service.service_version[0].parent is service